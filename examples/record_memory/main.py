@@ -0,0 +1,39 @@
+from metalware_sdk.havoc_common_schema import *
+
+from typing import Any, Callable
+import tracemalloc
+
+# Memory per schema record, measured with tracemalloc over COUNT instances, with
+# and without __slots__. Each record gets its own address and id, like records
+# decoded from a run's stats; the counts include those values and the list slot
+# holding the record.
+COUNT = 100_000
+BASE_ADDRESS = 0x0800_0000
+
+def bytes_per_instance(make: Callable[[int], Any]) -> float:
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  records = [None] * COUNT
+  for i in range(COUNT): records[i] = make(i)
+  after = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  return (after - before) / len(records)
+
+
+def without_slots(cls: type) -> type:
+  """Same constructor, but instances keep their fields in a __dict__."""
+  return type(f"{cls.__name__}WithDict", (), {'__init__': cls.__init__})
+
+
+samples = {
+  Testcase: lambda cls, i: cls(f"{i:011d}", "Crash", BASE_ADDRESS + i, 42, "2025-01-01T00:00:00Z"),
+  Block: lambda cls, i: cls(BASE_ADDRESS + i, i % 256),
+  Symbol: lambda cls, i: cls(BASE_ADDRESS + i, "main", 16),
+}
+
+print(f"{'record':<10} {'__dict__':>9} {'__slots__':>10}")
+for cls, make in samples.items():
+  dict_cls = without_slots(cls)
+  dict_size = bytes_per_instance(lambda i: make(dict_cls, i))
+  slots_size = bytes_per_instance(lambda i: make(cls, i))
+  print(f"{cls.__name__:<10} {dict_size:>8.0f}B {slots_size:>9.0f}B")
@@ -0,0 +1,127 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from metalware_sdk.havoc_symbols import SymbolTable
+from typing import Optional, List, Dict, Iterable
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+ARCHIVE_VERSION = 1
+COPY_CHUNK = 1024 * 1024
+
+def _write_json(zf: zipfile.ZipFile, name: str, obj: Any) -> None:
+  with zf.open(name, 'w') as f: f.write(json.dumps(obj).encode())
+
+
+def _read_json(zf: zipfile.ZipFile, name: str) -> Any:
+  with zf.open(name) as f: return json.load(f)
+
+
+def _referenced_hashes(config: dict) -> List[str]:
+  """File hashes used by an image config or by the memory layout of a project config."""
+  hashes = []
+  image_format = config.get("image_format") or {}
+  if image_format.get("Elf"): hashes.append(image_format["Elf"])
+  for segment in (image_format.get("Raw") or {}).get("segments", []): hashes.append(segment["hash"])
+  for memory in (config.get("device_config") or {}).get("memory_layout", []):
+    if memory.get("file"): hashes.append(memory["file"]["path"])
+  return hashes
+
+
+def _replace_strings(obj: Any, mapping: Dict[str, str]) -> Any:
+  if isinstance(obj, str): return mapping.get(obj, obj)
+  if isinstance(obj, list): return [_replace_strings(x, mapping) for x in obj]
+  if isinstance(obj, dict): return {k: _replace_strings(v, mapping) for k, v in obj.items()}
+  return obj
+
+
+def export_project(client: HavocClient, project_name: str, archive_path: str, files: Optional[Dict[str, str]] = None,
+                   run_ids: Iterable[int] = (), include_inputs: bool = True) -> None:
+  """Write a project's config, images, symbols and selected run corpora to a zip archive.
+
+  Entries are streamed to disk one at a time. The server cannot send back
+  uploaded firmware, so `files` maps the file hashes the images and the
+  project memory layout reference to local paths; they are stored in the
+  archive so `import_project` can upload them again.
+  """
+  files = files or {}
+  with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+    manifest = {"version": ARCHIVE_VERSION, "project": project_name, "images": [], "runs": [], "files": []}
+
+    def add_files(config: dict) -> None:
+      for file_hash in _referenced_hashes(config):
+        if file_hash in files and file_hash not in manifest["files"]:
+          zf.write(files[file_hash], f"files/{file_hash}")
+          manifest["files"].append(file_hash)
+
+    project_config = client.get_project_config(project_name).to_dict()
+    _write_json(zf, "project_config.json", project_config)
+    add_files(project_config)
+
+    for image_name in client.get_project_images(project_name):
+      config = client.get_project_image(project_name, image_name).to_dict()
+      symbols = SymbolTable.from_symbols(client.get_image_symbols(project_name, image_name))
+      _write_json(zf, f"images/{image_name}/config.json", config)
+      _write_json(zf, f"images/{image_name}/symbols.json", symbols.to_columnar())
+      manifest["images"].append(image_name)
+      add_files(config)
+
+    for run_id in run_ids:
+      summary = next((s for i, s in client.get_runs(project_name) if i == run_id), None)
+      if summary is not None: _write_json(zf, f"runs/{run_id}/summary.json", summary.to_dict())
+      input_ids = []
+      with zf.open(f"runs/{run_id}/testcases.jsonl", 'w') as out:
+        for testcase in client.iter_testcases(project_name, run_id):
+          out.write(json.dumps(testcase.to_dict()).encode() + b"\n")
+          input_ids.append(testcase.input_id)
+      # Only one zip entry can be open for writing, so inputs follow the testcase list.
+      for input_id in input_ids if include_inputs else []:
+        zf.writestr(f"runs/{run_id}/inputs/{input_id}", client.get_testcase_input_bytes(project_name, run_id, input_id))
+      manifest["runs"].append(run_id)
+
+    _write_json(zf, "manifest.json", manifest)
+
+
+def import_project(client: HavocClient, archive_path: str, project_name: Optional[str] = None, overwrite: bool = False) -> str:
+  """Recreate an exported project on `client`'s server and return its name.
+
+  Archived firmware is uploaded first, streamed through a temporary file, and
+  the project and image configs are rewritten to the hashes the new server
+  reports. Run corpora stay in the archive: the API has no endpoint for
+  injecting runs.
+  """
+  with zipfile.ZipFile(archive_path) as zf:
+    manifest = _read_json(zf, "manifest.json")
+    if manifest.get("version") != ARCHIVE_VERSION: raise ValueError(f"Unsupported archive version: {manifest.get('version')}")
+    project_name = project_name or manifest["project"]
+
+    hashes: Dict[str, str] = {}
+    for file_hash in manifest["files"]:
+      with tempfile.NamedTemporaryFile(delete=False) as tmp, zf.open(f"files/{file_hash}") as src:
+        shutil.copyfileobj(src, tmp, COPY_CHUNK)
+      try: hashes[file_hash] = client.upload_file(tmp.name, label=file_hash).hash
+      finally: os.unlink(tmp.name)
+
+    project_config = ProjectConfig.from_dict(_replace_strings(_read_json(zf, "project_config.json"), hashes))
+    client.create_project(project_name, project_config, overwrite)
+
+    for image_name in manifest["images"]:
+      config = ImageConfig.from_dict(_replace_strings(_read_json(zf, f"images/{image_name}/config.json"), hashes))
+      client.create_project_image(project_name, image_name, config)
+      symbols = SymbolTable.from_columnar(_read_json(zf, f"images/{image_name}/symbols.json"))
+      if len(symbols): client.set_image_symbols(project_name, image_name, symbols)
+  return project_name
+
+
+def migrate_project(source: HavocClient, destination: HavocClient, project_name: str, files: Optional[Dict[str, str]] = None,
+                    run_ids: Iterable[int] = (), overwrite: bool = False) -> str:
+  """Export a project from `source` and import it into `destination` through a temporary archive."""
+  fd, path = tempfile.mkstemp(suffix=".zip")
+  os.close(fd)
+  try:
+    export_project(source, project_name, path, files, run_ids)
+    return import_project(destination, path, overwrite=overwrite)
+  finally:
+    os.unlink(path)
@@ -0,0 +1,113 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Callable, Iterable, FrozenSet
+import queue
+import threading
+import time
+
+def candidate_patches(symbols: Iterable[Symbol], patch_types: Iterable[PatchType] = (PatchType.RETURN,),
+                      predicate: Optional[Callable[[Symbol], bool]] = None) -> List[Patch]:
+  """One patch per patch type for every sized symbol accepted by `predicate`."""
+  patches = []
+  for symbol in symbols:
+    if symbol.size == 0 or (predicate is not None and not predicate(symbol)): continue
+    for patch_type in patch_types:
+      patches.append(Patch(address=symbol.address & ~1, patch_type=patch_type))
+  return patches
+
+
+def dry_run_boots(client: HavocClient, project_name: str, image_name: str, timeout: float = 120.0, poll_interval: float = 1.0) -> bool:
+  """Dry-run an image. It boots if the run finishes within `timeout` and reports no hangs."""
+  run_id = client.start_run(project_name, RunConfig(image_name=image_name, dry_run=True))
+  deadline = time.monotonic() + timeout
+  while (status := client.get_run_status(project_name, run_id)) in (RunStatus.PENDING, RunStatus.RUNNING):
+    if time.monotonic() > deadline:
+      client.stop_run(project_name, run_id)
+      return False
+    time.sleep(poll_interval)
+  if status != RunStatus.FINISHED: return False
+  return len(client.get_run_stats(project_name, run_id, fields=['hangs']).hangs) == 0
+
+
+class PatchBisector:
+  """Finds a minimal subset of candidate patches that makes a failing image boot.
+
+  Runs delta debugging (ddmin) over `candidates`. The subsets of each round are
+  dry-run in parallel, each on its own scratch copy of the image named
+  `<image>-bisect-<n>`. `boots(client, project, image)` decides whether a dry run
+  succeeded; it defaults to `dry_run_boots`.
+  """
+
+  def __init__(self, client: HavocClient, project_name: str, image_name: str, candidates: List[Patch], parallelism: int = 4,
+               boots: Optional[Callable[[HavocClient, str, str], bool]] = None):
+    self.client = client
+    self.project_name = project_name
+    self.image_name = image_name
+    self.candidates = list(dict.fromkeys(candidates))
+    self.parallelism = max(1, parallelism)
+    self.boots = boots or dry_run_boots
+    self.results: Dict[FrozenSet[Patch], bool] = {}
+    self._results_lock = threading.Lock()
+    self._base = client.get_project_image(project_name, image_name)
+    self._slots: 'queue.Queue[str]' = queue.Queue()
+
+  def _create_slots(self) -> None:
+    for i in range(self.parallelism):
+      name = f"{self.image_name}-bisect-{i}"
+      if self.client.image_exists(self.project_name, name): self.client.delete_image(self.project_name, name)
+      self.client.create_project_image(self.project_name, name, self._base)
+      self._slots.put(name)
+
+  def _delete_slots(self) -> None:
+    while not self._slots.empty():
+      self.client.delete_image(self.project_name, self._slots.get())
+
+  def test(self, patches: List[Patch]) -> bool:
+    key = frozenset(patches)
+    with self._results_lock:
+      if key in self.results: return self.results[key]
+    slot = self._slots.get()
+    try:
+      config = ImageConfig(self._base.entry_address, self._base.image_arch, self._base.image_format,
+                           list(self._base.patches) + list(patches), list(self._base.symbols), self._base.handlers)
+      self.client.update_project_image(self.project_name, slot, config)
+      result = self.boots(self.client, self.project_name, slot)
+    finally:
+      self._slots.put(slot)
+    with self._results_lock: self.results[key] = result
+    return result
+
+  def _first_passing(self, pool: ThreadPoolExecutor, subsets: List[List[Patch]]) -> Optional[List[Patch]]:
+    for subset, ok in zip(subsets, pool.map(self.test, subsets)):
+      if ok: return subset
+    return None
+
+  def run(self) -> List[Patch]:
+    """Return a 1-minimal patch set. Raises RuntimeError if even all candidates together do not help."""
+    self._create_slots()
+    try:
+      with ThreadPoolExecutor(self.parallelism) as pool:
+        empty, full = pool.map(self.test, [[], self.candidates])
+        if empty: return []
+        if not full: raise RuntimeError("Image does not boot even with every candidate patch applied")
+
+        current, n = self.candidates, 2
+        while len(current) >= 2:
+          size = -(-len(current) // n)
+          chunks = [current[i:i + size] for i in range(0, len(current), size)]
+          subset = self._first_passing(pool, chunks)
+          if subset is not None:
+            current, n = subset, 2
+            continue
+          complements = [[p for j, c in enumerate(chunks) if j != i for p in c] for i in range(len(chunks))]
+          subset = self._first_passing(pool, complements) if len(chunks) > 2 else None
+          if subset is not None:
+            current, n = subset, max(n - 1, 2)
+          elif n < len(current):
+            n = min(2 * n, len(current))
+          else:
+            break
+        return current
+    finally:
+      self._delete_slots()
@@ -0,0 +1,91 @@
+from typing import Optional, List, Tuple
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+class DiskCache:
+  """Size-limited LRU cache of byte strings in a directory.
+
+  Entries are files grouped by namespace (the project name), so a whole
+  namespace can be dropped at once. Reading an entry bumps its mtime; when the
+  total size exceeds `max_bytes`, the least recently used files are removed.
+  Files are written under `tmp/` first, which eviction does not look at, and
+  then renamed into place.
+  """
+
+  def __init__(self, directory: str, max_bytes: int = 1024 ** 3):
+    self.directory = directory
+    self.max_bytes = max_bytes
+    self._lock = threading.Lock()
+    self._tmp = os.path.join(directory, 'tmp')
+    os.makedirs(self._tmp, exist_ok=True)
+    self._size = sum(size for _, _, size in self._entries())
+
+  @staticmethod
+  def _digest(s: str) -> str:
+    return hashlib.sha256(s.encode()).hexdigest()[:32]
+
+  def _path(self, namespace: str, key: str) -> str:
+    return os.path.join(self.directory, self._digest(namespace), self._digest(key))
+
+  def _entries(self) -> List[Tuple[float, str, int]]:
+    entries = []
+    for root, dirs, files in os.walk(self.directory):
+      if root == self.directory and 'tmp' in dirs: dirs.remove('tmp')
+      for name in files:
+        path = os.path.join(root, name)
+        try: st = os.stat(path)
+        except FileNotFoundError: continue
+        entries.append((st.st_mtime, path, st.st_size))
+    return entries
+
+  def get(self, namespace: str, key: str) -> Optional[bytes]:
+    path = self._path(namespace, key)
+    try:
+      with open(path, 'rb') as f: data = f.read()
+      os.utime(path)
+    except FileNotFoundError:
+      return None
+    return data
+
+  def put(self, namespace: str, key: str, data: bytes) -> None:
+    if len(data) > self.max_bytes: return
+    path = self._path(namespace, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=self._tmp)
+    with os.fdopen(fd, 'wb') as f: f.write(data)
+    with self._lock:
+      try: self._size -= os.path.getsize(path)
+      except FileNotFoundError: pass
+      os.replace(tmp, path)
+      self._size += len(data)
+      if self._size > self.max_bytes: self._evict()
+
+  def _evict(self) -> None:
+    entries = sorted(self._entries())
+    self._size = sum(size for _, _, size in entries)
+    for _, path, size in entries:
+      if self._size <= self.max_bytes: break
+      try: os.remove(path)
+      except FileNotFoundError: continue
+      self._size -= size
+
+  def delete(self, namespace: str, key: str) -> None:
+    path = self._path(namespace, key)
+    with self._lock:
+      try:
+        size = os.path.getsize(path)
+        os.remove(path)
+        self._size -= size
+      except FileNotFoundError:
+        pass
+
+  def clear(self, namespace: Optional[str] = None) -> None:
+    """Drop one namespace, or everything."""
+    names = [self._digest(namespace)] if namespace is not None else os.listdir(self.directory)
+    with self._lock:
+      for name in names:
+        if name != 'tmp': shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+      self._size = sum(size for _, _, size in self._entries())
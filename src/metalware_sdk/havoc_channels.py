@@ -0,0 +1,102 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_corpus import PackedCorpus
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Iterable
+import re
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+OUT_OF_FUZZ = re.compile(r'Out of fuzz for address:?\s*(0x[0-9a-fA-F]+)')
+
+@dataclass
+class ChannelStats:
+  """Fuzz consumption of one MMIO address across a corpus. Byte counts are per consuming input."""
+  address: int
+  inputs: int
+  total_bytes: int
+  mean: float
+  median: float
+  p90: float
+  max: int
+
+
+def _percentile(sorted_values: List[int], q: float) -> float:
+  pos = (len(sorted_values) - 1) * q
+  lo = int(pos)
+  hi = min(lo + 1, len(sorted_values) - 1)
+  return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def channel_stats(corpus: PackedCorpus) -> Dict[int, ChannelStats]:
+  """Per-address byte consumption distribution; vectorized with NumPy when it is installed."""
+  if np is None:
+    lengths: Dict[int, List[int]] = {}
+    for addr, length in zip(corpus.channel_addr, corpus.channel_length):
+      lengths.setdefault(addr, []).append(length)
+    result = {}
+    for addr, values in lengths.items():
+      values.sort()
+      result[addr] = ChannelStats(addr, len(values), sum(values), sum(values) / len(values),
+                                  _percentile(values, 0.5), _percentile(values, 0.9), values[-1])
+    return result
+
+  addrs = np.frombuffer(corpus.channel_addr, dtype=np.uint64)
+  lengths = np.frombuffer(corpus.channel_length, dtype=np.uint64).astype(np.float64)
+  if not len(addrs): return {}
+  order = np.lexsort((lengths, addrs))
+  addrs, lengths = addrs[order], lengths[order]
+  starts = np.flatnonzero(np.r_[True, addrs[1:] != addrs[:-1]])
+  counts = np.diff(np.r_[starts, len(addrs)])
+  totals = np.add.reduceat(lengths, starts)
+
+  def percentile(q: float) -> 'np.ndarray':
+    pos = (counts - 1) * q
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, counts - 1)
+    return lengths[starts + lo] + (lengths[starts + hi] - lengths[starts + lo]) * (pos - lo)
+
+  columns = zip(addrs[starts].tolist(), counts.tolist(), totals.tolist(), (totals / counts).tolist(),
+                percentile(0.5).tolist(), percentile(0.9).tolist(), lengths[starts + counts - 1].tolist())
+  return {addr: ChannelStats(addr, n, int(total), mean, median, p90, int(top))
+          for addr, n, total, mean, median, p90, top in columns}
+
+
+def hottest_channels(stats: Dict[int, ChannelStats], n: int = 10) -> List[ChannelStats]:
+  """The `n` addresses that consume the most fuzz bytes in total."""
+  return sorted(stats.values(), key=lambda s: s.total_bytes, reverse=True)[:n]
+
+
+def out_of_fuzz_address(exit_reason: str) -> Optional[int]:
+  """MMIO address named by an 'Out of fuzz for address: 0x...' exit reason, else None."""
+  match = OUT_OF_FUZZ.search(exit_reason)
+  return int(match.group(1), 16) if match else None
+
+
+def out_of_fuzz_channels(testcases: Iterable[Testcase]) -> Dict[int, int]:
+  """How many testcases ran out of fuzz on each address."""
+  counts: Counter = Counter()
+  for testcase in testcases:
+    addr = out_of_fuzz_address(testcase.exit_reason)
+    if addr is not None: counts[addr] += 1
+  return dict(counts)
+
+
+def crash_channels(corpus: PackedCorpus, crash_ids: Iterable[str]) -> Dict[int, int]:
+  """How many crashing inputs consumed each address; `crash_ids` are e.g. the ids of `RunStats.crashes`."""
+  crash_ids = set(crash_ids)
+  crashing = [i for i, input_id in enumerate(corpus.input_ids) if input_id in crash_ids]
+  if np is None:
+    crashing = set(crashing)
+    pairs = {(i, addr) for i, addr in zip(corpus.channel_input, corpus.channel_addr) if i in crashing}
+    return dict(Counter(addr for _, addr in pairs))
+
+  inputs = np.frombuffer(corpus.channel_input, dtype=np.uint32)
+  addrs = np.frombuffer(corpus.channel_addr, dtype=np.uint64)
+  mask = np.isin(inputs, np.array(crashing, dtype=np.uint32))
+  # Channel addresses are unique within an input, so each row is one (input, address) pair.
+  unique, counts = np.unique(addrs[mask], return_counts=True)
+  return dict(zip(unique.tolist(), counts.tolist()))
@@ -1,18 +1,89 @@
 from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_stream import iter_json_array
+from metalware_sdk.havoc_symbols import SymbolTable, iter_symbols_json, gzip_chunks
+from metalware_sdk.havoc_image_diff import ImageConfigDiff
+from metalware_sdk.havoc_dma import DMADescriptorTable, DMATableCache
+from metalware_sdk.havoc_cache import DiskCache
 import requests
 import base64
-from typing import Optional, Tuple, List, Dict, Union
-from dataclasses import dataclass
+from typing import Optional, Tuple, List, Dict, Union, Iterator, Sequence, Callable, Any
+from dataclasses import dataclass, field
 import os
+import gzip
+import json
+
+try:
+  import msgpack
+except ImportError:
+  msgpack = None
+
+class _Base64Reader:
+  """File-like view that base64-encodes `f` on the fly; its length lets requests send Content-Length."""
+
+  def __init__(self, f, size: int):
+    self._f = f
+    self._size = size
+    self._pending = b''
+
+  def __len__(self) -> int:
+    return 4 * ((self._size + 2) // 3)
+
+  def read(self, n: int = -1) -> bytes:
+    if n is None or n < 0:
+      out, self._pending = self._pending + base64.b64encode(self._f.read()), b''
+      return out
+    while len(self._pending) < n:
+      raw = self._f.read(3 * max(n // 4 + 1, 16384))
+      if not raw: break
+      self._pending += base64.b64encode(raw)
+    out, self._pending = self._pending[:n], self._pending[n:]
+    return out
+
 
 @dataclass
 class HavocClient:
   """Client for interacting with the Havoc web server API."""
   base_url: str
   session: requests.Session = requests.Session()
+  # Gzip JSON request bodies larger than compress_threshold bytes (needs server support).
+  compress_requests: bool = False
+  compress_threshold: int = 64 * 1024
+  # Ask for MessagePack instead of JSON on large list/stats responses (needs `msgpack`).
+  binary_encoding: bool = False
+  # Opt-in disk cache for responses that no longer change: inputs, stats and testcases of
+  # finished runs. Image symbols can change on the server, so with a cache they are only
+  # remembered in memory for the lifetime of the client, never on disk.
+  cache_dir: Optional[str] = None
+  cache_size: int = 1024 ** 3
+  # Revalidate polled endpoints with If-None-Match/If-Modified-Since; a 304 decodes the
+  # previous response body again, so nothing is transferred but each caller gets a new object.
+  conditional_requests: bool = True
+  # Last ImageConfig known to be on the server, per (project, image), as sent or fetched.
+  _image_configs: Dict[Tuple[str, str], dict] = field(default_factory=dict, init=False, repr=False)
+  # Symbols last fetched per (project, image), as sent by the server; only kept with cache_dir.
+  _image_symbols: Dict[Tuple[str, str], list] = field(default_factory=dict, init=False, repr=False)
+  _cache: Optional[DiskCache] = field(default=None, init=False, repr=False)
+  # created_at/modified_at of runs seen FINISHED, per (project, run_id).
+  _finished_runs: Dict[Tuple[str, int], str] = field(default_factory=dict, init=False, repr=False)
+  # (ETag, Last-Modified, body prefixed with b'm' or b'j') of the last response, per polled URL.
+  _validated: Dict[str, Tuple[Optional[str], Optional[str], bytes]] = field(default_factory=dict, init=False, repr=False)
+
+  def __post_init__(self):
+    if self.binary_encoding and msgpack is None:
+      raise RuntimeError("binary_encoding requires the 'msgpack' package.")
+    if self.cache_dir is not None: self._cache = DiskCache(self.cache_dir, self.cache_size)
 
   def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
     url = f"{self.base_url}/api/{endpoint.lstrip('/')}"
+    if self.compress_requests and kwargs.get('json') is not None:
+      body = json.dumps(kwargs.pop('json'), separators=(',', ':')).encode()
+      headers = dict(kwargs.pop('headers', None) or {})
+      headers['Content-Type'] = 'application/json'
+      if len(body) >= self.compress_threshold:
+        body = gzip.compress(body, compresslevel=5)
+        headers['Content-Encoding'] = 'gzip'
+      kwargs['data'] = body
+      kwargs['headers'] = headers
     try:
       resp = self.session.request(method, url, **kwargs)
       resp.raise_for_status()
@@ -20,6 +91,89 @@ class HavocClient:
     except requests.exceptions.RequestException as e:
       raise RuntimeError(f"Request to {url} failed: {str(e)}.")
 
+  def _request_json(self, method: str, endpoint: str, cache_key: Optional[Tuple[str, str]] = None, **kwargs):
+    # Response compression (gzip, and zstd/br when installed) is negotiated by requests itself.
+    # With a cache_key the encoded body is stored, prefixed with b'm' (msgpack) or b'j' (JSON).
+    def fetch() -> bytes:
+      resp = self._make_request(method, endpoint, **self._accept_binary(kwargs))
+      is_msgpack = resp.headers.get('Content-Type', '').startswith('application/msgpack')
+      return (b'm' if is_msgpack else b'j') + resp.content
+    body = self._cached(cache_key, fetch)
+    if body[:1] == b'm': return msgpack.unpackb(body[1:], raw=False, strict_map_key=False)
+    return json.loads(body[1:])
+
+  def _accept_binary(self, kwargs: dict) -> dict:
+    if self.binary_encoding:
+      headers = dict(kwargs.pop('headers', None) or {})
+      headers['Accept'] = 'application/msgpack, application/json;q=0.9'
+      kwargs['headers'] = headers
+    return kwargs
+
+  def _poll_json(self, endpoint: str, decode: Callable[[Any], Any], binary: bool = False, **kwargs) -> Any:
+    """GET `endpoint` and decode it, or decode the previous body again if the server answers 304 Not Modified."""
+    if not self.conditional_requests:
+      if binary: return decode(self._request_json('GET', endpoint, **kwargs))
+      return decode(self._make_request('GET', endpoint, **kwargs).json())
+    key = f"{endpoint}?{sorted((kwargs.get('params') or {}).items())}"
+    etag, last_modified, body = self._validated.get(key, (None, None, None))
+    headers = dict(kwargs.pop('headers', None) or {})
+    if etag is not None: headers['If-None-Match'] = etag
+    if last_modified is not None: headers['If-Modified-Since'] = last_modified
+    kwargs['headers'] = headers
+    resp = self._make_request('GET', endpoint, **(self._accept_binary(kwargs) if binary else kwargs))
+    # Keep the body rather than the decoded object: callers may decode differently or mutate the result.
+    if resp.status_code != 304 or key not in self._validated:
+      is_msgpack = resp.headers.get('Content-Type', '').startswith('application/msgpack')
+      body = (b'm' if is_msgpack else b'j') + resp.content
+      etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+      if etag is not None or last_modified is not None: self._validated[key] = (etag, last_modified, body)
+      else: self._validated.pop(key, None)
+    if body[:1] == b'm': return decode(msgpack.unpackb(body[1:], raw=False, strict_map_key=False))
+    return decode(json.loads(body[1:]))
+
+  def _cached(self, cache_key: Optional[Tuple[str, str]], fetch: Callable[[], bytes]) -> bytes:
+    if self._cache is None or cache_key is None: return fetch()
+    body = self._cache.get(*cache_key)
+    if body is None:
+      body = fetch()
+      self._cache.put(*cache_key, body)
+    return body
+
+  def _finished_run_key(self, project_name: str, run_id: int) -> Optional[str]:
+    """Version tag of a FINISHED run, or None while it can still change. Only asks the server when caching."""
+    if self._cache is None: return None
+    key = self._finished_runs.get((project_name, run_id))
+    if key is None:
+      summary = self.get_run_summary(project_name, run_id)
+      if summary.status != RunStatus.FINISHED: return None
+      key = self._finished_runs[(project_name, run_id)] = f"{summary.created_at}-{summary.modified_at}"
+    return key
+
+  def _run_cache_key(self, project_name: str, run_id: int, name: str) -> Optional[Tuple[str, str]]:
+    version = self._finished_run_key(project_name, run_id)
+    return (project_name, f"run/{run_id}/{version}/{name}") if version is not None else None
+
+  def _stream_json(self, endpoint: str, path: Sequence[str] = (), **kwargs) -> Iterator[Any]:
+    resp = self._make_request('GET', endpoint, stream=True, **kwargs)
+    try:
+      yield from iter_json_array(resp.iter_content(chunk_size=64 * 1024), path)
+    except requests.exceptions.RequestException as e:
+      raise RuntimeError(f"Streaming {resp.url} failed: {str(e)}.")
+    finally:
+      resp.close()
+
+  def _forget_image(self, project_name: str, image_name: str) -> None:
+    self._image_configs.pop((project_name, image_name), None)
+    self._image_symbols.pop((project_name, image_name), None)
+
+  def _forget_project(self, project_name: str) -> None:
+    for images in (self._image_configs, self._image_symbols):
+      for key in [key for key in images if key[0] == project_name]:
+        del images[key]
+    for key in [key for key in self._finished_runs if key[0] == project_name]:
+      del self._finished_runs[key]
+    if self._cache is not None: self._cache.clear(project_name)
+
   def get_projects(self) -> List[Tuple[str, int]]:
     resp = self._make_request('GET', '/projects')
     return resp.json()
@@ -28,19 +182,14 @@ class HavocClient:
     if not os.path.exists(file_path):
       raise FileNotFoundError(f"File not found: {file_path}")
       
+    # Stream the file as base64 instead of holding both encodings in memory.
     with open(file_path, 'rb') as f:
-      file_data = f.read()
-      
-    # Encode file data as base64
-    encoded_data = base64.b64encode(file_data)
-    
-    # Make request
-    resp = self._make_request(
-      'POST',
-      '/upload-file',
-      params={'label': label},
-      data=encoded_data
-    )
+      resp = self._make_request(
+        'POST',
+        '/upload-file',
+        params={'label': label},
+        data=_Base64Reader(f, os.path.getsize(file_path))
+      )
     
     result = resp.json()
     if isinstance(result, dict) and 'Ok' in result:
@@ -72,18 +221,34 @@ class HavocClient:
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Image creation failed: {result['Err']}")
-    else: return result['Ok']
-
-  def update_project_image(self, project_name: str, image_name: str, image_config: ImageConfig) -> None:
+    self._forget_image(project_name, image_name)
+    self._image_configs[(project_name, image_name)] = image_config.to_dict()
+    return result['Ok']
+
+  def update_project_image(self, project_name: str, image_name: str, image_config: ImageConfig, skip_unchanged: bool = True) -> bool:
+    """Upload `image_config`. Returns False without a request if it matches the last known server config."""
+    config = image_config.to_dict()
+    if skip_unchanged and self._image_configs.get((project_name, image_name)) == config: return False
     resp = self._make_request(
       'POST',
       f'/project/{project_name}/image/{image_name}',
-      json=image_config.to_dict()
+      json=config
     )
     
     result = resp.json()
+    self._forget_image(project_name, image_name)
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Image update failed: {result['Err']}")
+    self._image_configs[(project_name, image_name)] = config
+    return True
+
+  def apply_image_diff(self, project_name: str, image_name: str, diff: ImageConfigDiff) -> ImageConfig:
+    """Apply `diff` to the image's current config, upload the result if it changed and return it."""
+    cached = self._image_configs.get((project_name, image_name))
+    base = ImageConfig.from_dict(cached) if cached is not None else self.get_project_image(project_name, image_name)
+    config = diff.apply(base)
+    if not diff.is_empty(): self.update_project_image(project_name, image_name, config)
+    return config
 
   def project_image_exists(self, project_name: str, image_name: str) -> bool:
     resp = self._make_request(
@@ -101,7 +266,8 @@ class HavocClient:
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Image retrieval failed: {result['Err']}")
-    else: return ImageConfig.from_dict(result['Ok'])
+    self._image_configs[(project_name, image_name)] = result['Ok']
+    return ImageConfig.from_dict(result['Ok'])
 
   def get_project_images(self, project_name: str) -> List[str]:
     resp = self._make_request(
@@ -123,6 +289,7 @@ class HavocClient:
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Image deletion failed: {result['Err']}")
+    self._forget_image(project_name, image_name)
 
   def create_project(self, project_name: str, config: ProjectConfig, overwrite: bool = False) -> None:
     resp = self._make_request(
@@ -138,6 +305,7 @@ class HavocClient:
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Project creation failed: {result['Err']}")
+    self._forget_project(project_name)
 
   def project_exists(self, project_name: str) -> bool:
     resp = self._make_request(
@@ -163,6 +331,7 @@ class HavocClient:
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Project renaming failed: {result['Err']}")
+    self._forget_project(project_name)
 
   def delete_project(self, project_name: str) -> None:
     resp = self._make_request(
@@ -173,6 +342,7 @@ class HavocClient:
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Project deletion failed: {result['Err']}")
+    self._forget_project(project_name)
 
   def get_project_config(self, project_name: str) -> ProjectConfig:
     resp = self._make_request(
@@ -210,12 +380,13 @@ class HavocClient:
     else: return result['Ok']
 
   def get_run_status(self, project_name: str, run_id: int) -> RunStatus:
-    resp = self._make_request(
-      'GET',
-      f'/project/{project_name}/run/{run_id}/summary'
+    return self.get_run_summary(project_name, run_id).status
+
+  def get_run_summary(self, project_name: str, run_id: int) -> RunSummary:
+    return self._poll_json(
+      f'/project/{project_name}/run/{run_id}/summary',
+      RunSummary.from_dict
     )
-    result = resp.json()
-    return RunSummary.from_dict(result).status
 
   def stop_run(self, project_name: str, run_id: int) -> None:
     resp = self._make_request(
@@ -227,53 +398,147 @@ class HavocClient:
       raise RuntimeError(f"Stop run failed: {resp.text}")
 
   def get_runs(self, project_name: str) -> List[Tuple[int, RunSummary]]:
-    resp = self._make_request(
-      'GET',
-      f'/project/{project_name}/runs'
+    return self._poll_json(
+      f'/project/{project_name}/runs',
+      lambda result: [(run_id, RunSummary.from_dict(run)) for (run_id, run) in result],
+      binary=True
     )
-    return [(run_id, RunSummary.from_dict(run)) for (run_id, run) in resp.json()]
 
-  def get_run_stats(self, project_name: str, run_id: int) -> RunStats:
-    resp = self._make_request(
+  def fleet_snapshot(self, projects: Optional[List[str]] = None, max_workers: int = 16, include_stats: bool = True) -> 'FleetSnapshot':
+    """Status and stats counts of every run, fetched concurrently; see havoc_fleet.fleet_snapshot."""
+    from metalware_sdk.havoc_fleet import fleet_snapshot
+    return fleet_snapshot(self, projects, max_workers, include_stats)
+
+  def iter_runs(self, project_name: str) -> Iterator[Tuple[int, RunSummary]]:
+    for run_id, run in self._stream_json(f'/project/{project_name}/runs'):
+      yield run_id, RunSummary.from_dict(run)
+
+  def get_run_stats(self, project_name: str, run_id: int, fields: Optional[List[str]] = None, lazy: bool = False) -> Union[RunStats, LazyRunStats]:
+    # Asking for a subset of fields, or lazy=True, returns a LazyRunStats that decodes on access.
+    if fields is not None:
+      unknown = set(fields) - set(LazyRunStats.FIELDS)
+      if unknown: raise ValueError(f"Unknown RunStats fields: {sorted(unknown)}")
+    decode = LazyRunStats if fields or lazy else RunStats.from_dict
+    params = {'fields': ','.join(fields)} if fields else None
+    cache_key = self._run_cache_key(project_name, run_id, f"stats?{','.join(fields or [])}")
+    if cache_key is None:
+      return self._poll_json(f'/project/{project_name}/run/{run_id}/stats', decode, binary=True, params=params)
+    return decode(self._request_json(
       'GET',
-      f'/project/{project_name}/run/{run_id}/stats'
-    )
-    return RunStats.from_dict(resp.json())
+      f'/project/{project_name}/run/{run_id}/stats',
+      cache_key=cache_key,
+      params=params
+    ))
+
+  def watch_run(self, project_name: str, run_id: int, on_crash: Optional[Callable[[Crash], None]] = None,
+                on_hang: Optional[Callable[[Hang], None]] = None, on_new_block: Optional[Callable[[Block], None]] = None,
+                interval: float = 5.0, max_pending: int = 1024, replay_existing: bool = True) -> 'RunWatcher':
+    """Start a background RunWatcher that calls the callbacks for each new crash, hang and block."""
+    from metalware_sdk.havoc_watch import RunWatcher
+    return RunWatcher(self, project_name, run_id, on_crash, on_hang, on_new_block, interval, max_pending, replay_existing).start()
+
+  def get_dma_table(self, project_name: str, run_id: int, cache: Optional[DMATableCache] = None) -> DMADescriptorTable:
+    """Fetch only the DMA config and return it flattened, reusing `cache` across polls."""
+    raw = self.get_run_stats(project_name, run_id, fields=['dma_config']).raw['dma_config']
+    return cache.get(raw) if cache is not None else DMADescriptorTable.from_dict(raw)
+
+  def iter_run_stats(self, project_name: str, run_id: int, field: str) -> Iterator[Any]:
+    """Stream one list section of the run stats, e.g. 'crashes', 'hangs' or 'new_blocks'."""
+    decoders = {
+      'block_frequency_map': lambda x: from_list(from_int, x),
+      'coverage': lambda x: from_list(from_int, x),
+      'crashes': Crash.from_dict,
+      'hangs': Hang.from_dict,
+      'new_blocks': Block.from_dict,
+    }
+    if field not in decoders: raise ValueError(f"{field} is not a list section of RunStats")
+    decode = decoders[field]
+    for item in self._stream_json(f'/project/{project_name}/run/{run_id}/stats', path=[field], params={'fields': field}):
+      yield decode(item)
+
+  def set_image_symbols(self, project_name: str, image_name: str, symbols: Union[List[Symbol], SymbolTable], chunk_size: Optional[int] = None) -> None:
+    # With chunk_size (or a SymbolTable) the JSON body is generated and sent chunk by chunk.
+    if chunk_size is None and not isinstance(symbols, SymbolTable):
+      kwargs = {'json': [symbol.to_dict() for symbol in symbols]}
+    else:
+      table = symbols if isinstance(symbols, SymbolTable) else SymbolTable.from_symbols(symbols)
+      body = iter_symbols_json(table, chunk_size or 4096)
+      headers = {'Content-Type': 'application/json'}
+      if self.compress_requests:
+        body = gzip_chunks(body)
+        headers['Content-Encoding'] = 'gzip'
+      kwargs = {'data': body, 'headers': headers}
 
-  def set_image_symbols(self, project_name: str, image_name: str, symbols: List[Symbol]) -> None:
     resp = self._make_request(
       'POST',
       f'/project/{project_name}/image/{image_name}/symbols',
-      json=[symbol.to_dict() for symbol in symbols]
+      **kwargs
     )
 
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Symbol setting failed: {result['Err']}")
-
-  def get_image_symbols(self, project_name: str, image_name: str) -> List[Symbol]:
-    resp = self._make_request(
+    self._forget_image(project_name, image_name)
+
+  def update_image_symbols(self, project_name: str, image_name: str, symbols: Union[List[Symbol], SymbolTable], chunk_size: Optional[int] = 4096) -> bool:
+    """Replace the image symbols only if they differ from the server's. Returns whether anything was sent."""
+    table = symbols if isinstance(symbols, SymbolTable) else SymbolTable.from_symbols(symbols)
+    return self._replace_symbols(project_name, image_name, self._server_symbols(project_name, image_name), table, chunk_size)
+
+  def append_image_symbols(self, project_name: str, image_name: str, symbols: Union[List[Symbol], SymbolTable], chunk_size: Optional[int] = 4096) -> bool:
+    """Add symbols to the image, replacing existing ones with the same name."""
+    table = symbols if isinstance(symbols, SymbolTable) else SymbolTable.from_symbols(symbols)
+    current = self._server_symbols(project_name, image_name)
+    return self._replace_symbols(project_name, image_name, current, current.merged(table), chunk_size)
+
+  def _replace_symbols(self, project_name: str, image_name: str, current: SymbolTable, table: SymbolTable,
+                       chunk_size: Optional[int]) -> bool:
+    added, removed = current.diff(table)
+    if len(added) == 0 and len(removed) == 0: return False
+    self.set_image_symbols(project_name, image_name, table, chunk_size)
+    return True
+
+  def _fetch_image_symbols(self, project_name: str, image_name: str) -> list:
+    result = self._request_json(
       'GET',
       f'/project/{project_name}/image/{image_name}/symbols'
     )
-    result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Symbol retrieval failed: {result['Err']}")
-    else: return [Symbol.from_dict(symbol) for symbol in result['Ok']]
+    symbols = result['Ok']
+    if self._cache is not None: self._image_symbols[(project_name, image_name)] = symbols
+    return symbols
+
+  def _server_symbols(self, project_name: str, image_name: str) -> SymbolTable:
+    """Current symbols as read from the server, bypassing the in-memory copy."""
+    return SymbolTable.from_symbols([Symbol.from_dict(symbol) for symbol in self._fetch_image_symbols(project_name, image_name)])
+
+  def get_image_symbols(self, project_name: str, image_name: str) -> List[Symbol]:
+    symbols = self._image_symbols.get((project_name, image_name))
+    if symbols is None: symbols = self._fetch_image_symbols(project_name, image_name)
+    return [Symbol.from_dict(symbol) for symbol in symbols]
 
   def get_testcases(self, project_name: str, run_id: int) -> List[Testcase]:
-    resp = self._make_request(
+    result = self._request_json(
       'GET',
-      f'/project/{project_name}/run/{run_id}/testcases'
+      f'/project/{project_name}/run/{run_id}/testcases',
+      cache_key=self._run_cache_key(project_name, run_id, "testcases")
     )
-    return [Testcase.from_dict(testcase) for testcase in resp.json()]
+    return [Testcase.from_dict(testcase) for testcase in result]
+
+  def iter_testcases(self, project_name: str, run_id: int) -> Iterator[Testcase]:
+    for testcase in self._stream_json(f'/project/{project_name}/run/{run_id}/testcases'):
+      yield Testcase.from_dict(testcase)
 
   def get_testcase_input(self, project_name: str, run_id: int, testcase_id: str) -> TestcaseInput:
-    resp = self._make_request(
+    return TestcaseInput.from_bytes(self.get_testcase_input_bytes(project_name, run_id, testcase_id))
+
+  def get_testcase_input_bytes(self, project_name: str, run_id: int, testcase_id: str) -> bytes:
+    fetch = lambda: self._make_request(
       'GET',
       f'/project/{project_name}/run/{run_id}/testcase/{testcase_id}/input'
-    )
-    return TestcaseInput.from_bytes(resp.content)
+    ).content
+    return self._cached(self._run_cache_key(project_name, run_id, f"input/{testcase_id}"), fetch)
 
   def start_debug_session(self, project_name: str, run_id: int, testcase_id: str) -> None:
     resp = self._make_request(
@@ -302,31 +567,29 @@ class HavocClient:
       raise FileNotFoundError(f"File not found: {zip_path}")
 
     with open(zip_path, 'rb') as f:
-      zip_data = f.read()
-
-    resp = self._make_request(
-      'POST',
-      f'/inject-project',
-      data=zip_data
-    )
+      resp = self._make_request(
+        'POST',
+        f'/inject-project',
+        data=f
+      )
 
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Project injection failed: {result['Err']}")
+    if self._cache is not None: self._cache.clear()
 
   def inject_image(self, zip_path: str) -> None:
     if not os.path.exists(zip_path):
       raise FileNotFoundError(f"File not found: {zip_path}")
 
     with open(zip_path, 'rb') as f:
-      zip_data = f.read()
-
-    resp = self._make_request(
-      'POST',
-      f'/inject-image',
-      data=zip_data,
-    )
+      resp = self._make_request(
+        'POST',
+        f'/inject-image',
+        data=f,
+      )
 
     result = resp.json()
     if isinstance(result, dict) and 'Err' in result:
       raise RuntimeError(f"Image injection failed: {result['Err']}")
+    if self._cache is not None: self._cache.clear()
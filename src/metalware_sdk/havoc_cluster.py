@@ -0,0 +1,110 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+import requests
+import inspect
+import threading
+from typing import Optional, Tuple, List, Dict
+
+ACTIVE_STATUSES = (RunStatus.PENDING, RunStatus.RUNNING)
+
+class HavocCluster:
+  """Routes HavocClient calls across several Havoc servers.
+
+  New projects go to the least loaded node. A project may live on several
+  nodes, in which case `start_run` picks the least loaded of them. Every other
+  project-scoped call is forwarded to the node that owns the project, or the
+  run when a `run_id` is given.
+  """
+
+  def __init__(self, clients: List[HavocClient]):
+    if not clients: raise ValueError("A cluster needs at least one client")
+    self.clients = clients
+    self._lock = threading.Lock()
+    self._owners: Dict[str, List[HavocClient]] = {}
+    self._run_owners: Dict[Tuple[str, int], HavocClient] = {}
+    self.refresh()
+
+  @staticmethod
+  def from_urls(base_urls: List[str], **kwargs) -> 'HavocCluster':
+    return HavocCluster([HavocClient(url, session=requests.Session(), **kwargs) for url in base_urls])
+
+  def refresh(self) -> None:
+    """Re-discover which node owns which project."""
+    owners: Dict[str, List[HavocClient]] = {}
+    for client in self.clients:
+      for project_name, _ in client.get_projects():
+        owners.setdefault(project_name, []).append(client)
+    with self._lock:
+      self._owners = owners
+      self._run_owners = {k: v for k, v in self._run_owners.items() if k[0] in owners}
+
+  def get_projects(self) -> List[Tuple[str, int]]:
+    return [project for client in self.clients for project in client.get_projects()]
+
+  def node_load(self, client: HavocClient) -> Tuple[int, int]:
+    """(active runs, summed throughput of running runs) for one node. Lower is less loaded."""
+    active, throughput = 0, 0
+    for project_name, _ in client.get_projects():
+      for run_id, summary in client.get_runs(project_name):
+        if summary.status not in ACTIVE_STATUSES: continue
+        active += 1
+        if summary.status == RunStatus.RUNNING:
+          throughput += client.get_run_stats(project_name, run_id, fields=['throughput']).throughput
+    return active, throughput
+
+  def least_loaded(self, candidates: Optional[List[HavocClient]] = None) -> HavocClient:
+    candidates = candidates or self.clients
+    if len(candidates) == 1: return candidates[0]
+    return min(candidates, key=self.node_load)
+
+  def client_for(self, project_name: str, run_id: Optional[int] = None) -> HavocClient:
+    with self._lock:
+      if run_id is not None and (project_name, run_id) in self._run_owners:
+        return self._run_owners[(project_name, run_id)]
+      owners = self._owners.get(project_name)
+    if owners is None:
+      self.refresh()
+      with self._lock: owners = self._owners.get(project_name)
+    if not owners: raise RuntimeError(f"Project {project_name} not found on any node")
+    if run_id is not None and len(owners) > 1:
+      raise RuntimeError(f"Run {run_id} of {project_name} was not started through this cluster and the project lives on several nodes")
+    return owners[0]
+
+  def create_project(self, project_name: str, config: ProjectConfig, overwrite: bool = False) -> HavocClient:
+    with self._lock: owners = self._owners.get(project_name)
+    client = owners[0] if owners else self.least_loaded()
+    client.create_project(project_name, config, overwrite)
+    with self._lock: self._owners.setdefault(project_name, [client])
+    return client
+
+  def project_exists(self, project_name: str) -> bool:
+    return any(client.project_exists(project_name) for client in self.clients)
+
+  def start_run(self, project_name: str, config: RunConfig) -> int:
+    with self._lock: owners = self._owners.get(project_name)
+    if not owners: owners = [self.client_for(project_name)]
+    client = self.least_loaded(owners)
+    run_id = client.start_run(project_name, config)
+    with self._lock: self._run_owners[(project_name, run_id)] = client
+    return run_id
+
+  def rename_project(self, project_name: str, new_name: str) -> None:
+    self.client_for(project_name).rename_project(project_name, new_name)
+    self.refresh()
+
+  def delete_project(self, project_name: str) -> None:
+    self.client_for(project_name).delete_project(project_name)
+    self.refresh()
+
+  def __getattr__(self, name: str):
+    method = getattr(HavocClient, name, None)
+    if name.startswith('_') or not callable(method): raise AttributeError(name)
+    signature = inspect.signature(method)
+    if list(signature.parameters)[1:2] != ['project_name']:
+      raise AttributeError(f"{name} is not project-scoped; call it on client_for(project_name) instead")
+
+    def routed(*args, **kwargs):
+      arguments = signature.bind(None, *args, **kwargs).arguments
+      client = self.client_for(arguments['project_name'], arguments.get('run_id'))
+      return getattr(client, name)(*args, **kwargs)
+    return routed
@@ -56,6 +56,33 @@ def from_dict(f: Callable[[Any], T], x: Any) -> Dict[str, T]:
     return { k: f(v) for (k, v) in x.items() }
 
 
+def _freeze(x: Any) -> Any:
+    if isinstance(x, list):
+        return tuple(_freeze(y) for y in x)
+    if isinstance(x, dict):
+        return tuple(sorted((k, _freeze(v)) for (k, v) in x.items()))
+    return x
+
+
+class Record:
+    """Base for high-cardinality records: no per-instance __dict__, structural equality and hashing.
+
+    Records stay mutable and the hash covers every field, lists included. Do not
+    modify a record while it is in a set or used as a dict key: it would no
+    longer be found under its new hash.
+    """
+    __slots__ = ()
+
+    def _key(self) -> tuple:
+        return tuple(_freeze(getattr(self, name)) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and self._key() == cast(Record, other)._key()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self._key()))
+
+
 class Cwe(Enum):
     CRASH_ON_ADDRESS = "CrashOnAddress"
     IMPROPER_CHECK_FOR_UNUSUAL_CONDITIONS = "ImproperCheckForUnusualConditions"
@@ -63,7 +90,8 @@ class Cwe(Enum):
     OUT_OF_BOUNDS_WRITE = "OutOfBoundsWrite"
 
 
-class Event:
+class Event(Record):
+    __slots__ = ('block_id', 'callstack', 'dwarf_stack_trace', 'label', 'pc')
     block_id: int
     callstack: List[int]
     dwarf_stack_trace: Optional[str]
@@ -98,7 +126,8 @@ class Event:
         return result
 
 
-class ClassifiedCrash:
+class ClassifiedCrash(Record):
+    __slots__ = ('cwes', 'events', 'suspected_false_positive', 'taint_trace')
     cwes: List[Cwe]
     events: List[Event]
     suspected_false_positive: bool
@@ -128,7 +157,8 @@ class ClassifiedCrash:
         return result
 
 
-class UnclassifiedCrash:
+class UnclassifiedCrash(Record):
+    __slots__ = ('callstack', 'classification_failure', 'label')
     callstack: List[int]
     classification_failure: str
     label: str
@@ -154,7 +184,8 @@ class UnclassifiedCrash:
         return result
 
 
-class AnalysisResult:
+class AnalysisResult(Record):
+    __slots__ = ('classified_crash', 'unclassified_crash')
     classified_crash: Optional[ClassifiedCrash]
     unclassified_crash: Optional[UnclassifiedCrash]
 
@@ -313,6 +344,11 @@ class DeviceConfig:
         result["memory_layout"] = from_list(lambda x: to_class(Memory, x), self.memory_layout)
         return result
 
+    def memory_map(self) -> 'MemoryMap':
+        """Validated address index over `memory_layout`; raises ValueError on an inconsistent layout."""
+        from metalware_sdk.havoc_memory_map import MemoryMap
+        return MemoryMap(self.memory_layout)
+
     def __repr__(self) -> str:
         return json.dumps(self.to_dict(), indent=2)
 
@@ -386,7 +422,8 @@ class DMABuffer:
         return result
 
 
-class Handler:
+class Handler(Record):
+    __slots__ = ('action', 'address')
     action: str
     address: int
 
@@ -483,7 +520,8 @@ class PatchType(Enum):
     RETURN1 = "Return1"
 
 
-class Patch:
+class Patch(Record):
+    __slots__ = ('address', 'patch_type')
     address: int
     patch_type: PatchType
 
@@ -505,7 +543,8 @@ class Patch:
         return result
 
 
-class Symbol:
+class Symbol(Record):
+    __slots__ = ('address', 'name', 'size')
     address: int
     name: str
     size: int
@@ -676,7 +715,8 @@ class RunConfig:
         return result
 
 
-class Crash:
+class Crash(Record):
+    __slots__ = ('id', 'result')
     id: str
     result: AnalysisResult
 
@@ -887,7 +927,7 @@ class DMAConfig:
         for addr, srange in obj.get("buffers", {}).items():
           min = srange['min'].removeprefix("+")
           max = srange['max'].removeprefix("+")
-          buffers[addr.removeprefix("+")] = SizeRange(int(min, 16), int(max, 16))
+          buffers[addr.removeprefix("+")] = SizeRange(max=int(max, 16), min=int(min, 16))
         descriptors = from_list(DMADescriptorHead.from_dict, obj.get("descriptors"))
         return DMAConfig(buffers, descriptors)
 
@@ -899,7 +939,8 @@ class DMAConfig:
         return result
 
 
-class DefectMetadata:
+class DefectMetadata(Record):
+    __slots__ = ('callstack', 'count', 'exit', 'id')
     callstack: List[int]
     count: int
     exit: str
@@ -929,7 +970,8 @@ class DefectMetadata:
         return result
 
 
-class Hang:
+class Hang(Record):
+    __slots__ = ('id', 'result')
     id: str
     result: DefectMetadata
 
@@ -951,7 +993,8 @@ class Hang:
         return result
 
 
-class Block:
+class Block(Record):
+    __slots__ = ('address', 'time_to_discover')
     address: int
     time_to_discover: int
 
@@ -1019,6 +1062,56 @@ class RunStats:
         return result
 
 
+class _LazyField:
+    """Non-data descriptor that decodes one raw JSON field on first access and caches the result."""
+
+    def __init__(self, decode: Callable[[Any], Any]) -> None:
+        self.decode = decode
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        if self.name not in obj.raw:
+            raise AttributeError(f"RunStats field '{self.name}' was not fetched")
+        value = self.decode(obj.raw[self.name])
+        obj.__dict__[self.name] = value
+        return value
+
+
+class LazyRunStats:
+    """RunStats view over the raw JSON that decodes each field on first access."""
+    FIELDS = ("block_frequency_map", "coverage", "crashes", "dma_config", "executions", "hangs", "new_blocks", "throughput")
+
+    block_frequency_map = _LazyField(lambda x: from_list(lambda x: from_list(from_int, x), x))
+    coverage = _LazyField(lambda x: from_list(lambda x: from_list(from_int, x), x))
+    crashes = _LazyField(lambda x: from_list(Crash.from_dict, x))
+    dma_config = _LazyField(DMAConfig.from_dict)
+    executions = _LazyField(from_int)
+    hangs = _LazyField(lambda x: from_list(Hang.from_dict, x))
+    new_blocks = _LazyField(lambda x: from_list(Block.from_dict, x))
+    throughput = _LazyField(from_int)
+
+    def __init__(self, raw: dict) -> None:
+        assert isinstance(raw, dict)
+        self.raw = raw
+
+    @staticmethod
+    def from_dict(obj: Any) -> 'LazyRunStats':
+        return LazyRunStats(obj)
+
+    def fields(self) -> List[str]:
+        return [name for name in LazyRunStats.FIELDS if name in self.raw]
+
+    def to_run_stats(self) -> RunStats:
+        return RunStats.from_dict(self.raw)
+
+    def to_dict(self) -> dict:
+        return self.raw
+
+
 class RunStatus(Enum):
     CRASHED = "Crashed"
     ERROR = "Error"
@@ -1053,33 +1146,8 @@ class RunSummary:
         return result
 
 
-class Symbol:
-    address: int
-    name: str
-    size: int
-
-    def __init__(self, address: int, name: str, size: int) -> None:
-        self.address = address
-        self.name = name
-        self.size = size
-
-    @staticmethod
-    def from_dict(obj: Any) -> 'Symbol':
-        assert isinstance(obj, dict)
-        address = from_int(obj.get("address"))
-        name = from_str(obj.get("name"))
-        size = from_int(obj.get("size"))
-        return Symbol(address, name, size)
-
-    def to_dict(self) -> dict:
-        result: dict = {}
-        result["address"] = from_int(self.address)
-        result["name"] = from_str(self.name)
-        result["size"] = from_int(self.size)
-        return result
-
-
-class TraceSummaryEntry:
+class TraceSummaryEntry(Record):
+    __slots__ = ('exit_pc', 'exit_reason', 'input_label', 'num_blocks', 'timestamp')
     exit_pc: int
     exit_reason: str
     input_label: str
@@ -1130,7 +1198,8 @@ class TraceSummary:
         result["entries"] = from_list(lambda x: to_class(TraceSummaryEntry, x), self.entries)
         return result
 
-class Testcase:
+class Testcase(Record):
+    __slots__ = ('input_id', 'exit_reason', 'exit_pc', 'num_blocks', 'timestamp')
     input_id: str
     exit_reason: str
     exit_pc: int
@@ -1210,6 +1279,12 @@ class TestcaseInput:
 
         return TestcaseInput(channels)
 
+    def to_bytes(self) -> bytes:
+        out = [b'hav\x02', struct.pack('<I', len(self.channels))]
+        out += [struct.pack('<QQ', addr, len(data)) for addr, data in self.channels.items()]
+        out += list(self.channels.values())
+        return b''.join(out)
+
 
 class UploadImageRequest:
     label: str
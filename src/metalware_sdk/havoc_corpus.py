@@ -0,0 +1,170 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from metalware_sdk.havoc_coverage import CoverageSet
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import partial
+from typing import Optional, Tuple, List, Dict, Callable, Iterable
+import heapq
+import struct
+import sys
+
+PACKED_MAGIC = b'HVPC'
+PACKED_VERSION = 1
+
+class PackedCorpus:
+  """Many TestcaseInputs in one byte buffer plus a flat channel index.
+
+  Channel k belongs to input `channel_input[k]`, has address `channel_addr[k]`,
+  and its bytes are `data[channel_offset[k]:channel_offset[k] + channel_length[k]]`.
+  """
+
+  def __init__(self) -> None:
+    self.input_ids: List[str] = []
+    self.channel_input = array('I')
+    self.channel_addr = array('Q')
+    self.channel_offset = array('Q')
+    self.channel_length = array('Q')
+    self._data = bytearray()
+
+  @property
+  def data(self) -> bytes:
+    return bytes(self._data)
+
+  def add(self, input_id: str, testcase_input: TestcaseInput) -> None:
+    index = len(self.input_ids)
+    self.input_ids.append(input_id)
+    for addr, data in testcase_input.channels.items():
+      self.channel_input.append(index)
+      self.channel_addr.append(addr)
+      self.channel_offset.append(len(self._data))
+      self.channel_length.append(len(data))
+      self._data += data
+
+  def input(self, index: int) -> TestcaseInput:
+    # Channels of one input are contiguous and channel_input is sorted.
+    channels = {}
+    for k in range(bisect_left(self.channel_input, index), bisect_right(self.channel_input, index)):
+      start = self.channel_offset[k]
+      channels[self.channel_addr[k]] = bytes(self._data[start:start + self.channel_length[k]])
+    return TestcaseInput(channels)
+
+  def __len__(self) -> int:
+    return len(self.input_ids)
+
+  def save(self, path: str) -> None:
+    columns = [self.channel_input, self.channel_addr, self.channel_offset, self.channel_length]
+    if sys.byteorder != 'little':
+      columns = [array(c.typecode, c) for c in columns]
+      for column in columns: column.byteswap()
+    with open(path, 'wb') as f:
+      f.write(PACKED_MAGIC + struct.pack('<IIQQ', PACKED_VERSION, len(self.input_ids), len(self.channel_input), len(self._data)))
+      for input_id in self.input_ids:
+        encoded = input_id.encode()
+        f.write(struct.pack('<H', len(encoded)) + encoded)
+      for column in columns: f.write(column.tobytes())
+      f.write(self._data)
+
+  @staticmethod
+  def load(path: str) -> 'PackedCorpus':
+    corpus = PackedCorpus()
+    with open(path, 'rb') as f:
+      if f.read(4) != PACKED_MAGIC: raise ValueError(f"{path} is not a packed corpus")
+      version, num_inputs, num_channels, data_size = struct.unpack('<IIQQ', f.read(24))
+      if version != PACKED_VERSION: raise ValueError(f"Unsupported packed corpus version: {version}")
+      for _ in range(num_inputs):
+        (length,) = struct.unpack('<H', f.read(2))
+        corpus.input_ids.append(f.read(length).decode())
+      for column in (corpus.channel_input, corpus.channel_addr, corpus.channel_offset, corpus.channel_length):
+        column.frombytes(f.read(num_channels * column.itemsize))
+        if sys.byteorder != 'little': column.byteswap()
+      corpus._data = bytearray(f.read(data_size))
+    return corpus
+
+
+def greedy_set_cover(coverage: Dict[str, CoverageSet], weights: Optional[Dict[str, int]] = None) -> List[str]:
+  """Inputs that together cover every block, chosen greedily by new blocks per unit weight.
+
+  Uses lazy evaluation: a candidate's gain is only recomputed when it reaches
+  the top of the heap, since gains can only shrink as coverage grows.
+  """
+  weights = weights or {}
+  covered = CoverageSet()
+  heap = [(-len(blocks) / max(weights.get(key, 1), 1), key) for key, blocks in coverage.items() if len(blocks)]
+  heapq.heapify(heap)
+  chosen = []
+  while heap:
+    _, key = heapq.heappop(heap)
+    gain = len(coverage[key] - covered) / max(weights.get(key, 1), 1)
+    if gain == 0: continue
+    if heap and gain < -heap[0][0]:
+      heapq.heappush(heap, (-gain, key))
+      continue
+    chosen.append(key)
+    covered |= coverage[key]
+  return chosen
+
+
+def _coverage_set(coverage_fn: Callable[[Testcase], Iterable[int]], testcase: Testcase) -> CoverageSet:
+  """Coverage bitmap of one testcase, built in the worker so only the bitmap is sent back."""
+  return CoverageSet(coverage_fn(testcase))
+
+
+class _SignatureFeatures:
+  """Fallback coverage: one interned feature per (exit_pc, exit_reason, log2(num_blocks)) signature."""
+
+  def __init__(self) -> None:
+    self._ids: Dict[Tuple, int] = {}
+
+  def __call__(self, testcase: Testcase) -> List[int]:
+    key = (testcase.exit_pc, testcase.exit_reason, testcase.num_blocks.bit_length())
+    return [self._ids.setdefault(key, len(self._ids))]
+
+
+class CorpusMinimizer:
+  """afl-cmin style minimizer for the queue of a run.
+
+  `coverage_fn(testcase)` must return the block addresses a testcase covers.
+  The Havoc API does not expose per-testcase coverage, so without it the
+  minimizer keeps one input per distinct combination of exit PC, exit reason
+  and block-count bucket. If `processes` is set, the coverage bitmaps are built in a process
+  pool; `coverage_fn` must then be picklable. Inputs are fetched on
+  `fetch_workers` threads.
+  """
+
+  def __init__(self, client: HavocClient, project_name: str, run_id: int,
+               coverage_fn: Optional[Callable[[Testcase], Iterable[int]]] = None,
+               processes: Optional[int] = None, fetch_workers: int = 8):
+    self.client = client
+    self.project_name = project_name
+    self.run_id = run_id
+    self.coverage_fn = coverage_fn
+    self.processes = processes
+    self.fetch_workers = fetch_workers
+
+  def coverage(self, testcases: List[Testcase]) -> Dict[str, CoverageSet]:
+    if self.coverage_fn is None:
+      features = _SignatureFeatures()
+      return {t.input_id: CoverageSet(features(t)) for t in testcases}
+    if self.processes:
+      with ProcessPoolExecutor(self.processes) as pool:
+        sets = list(pool.map(partial(_coverage_set, self.coverage_fn), testcases, chunksize=64))
+    else:
+      sets = [CoverageSet(self.coverage_fn(t)) for t in testcases]
+    return {t.input_id: s for t, s in zip(testcases, sets)}
+
+  def minimize(self, testcases: Optional[List[Testcase]] = None) -> List[Testcase]:
+    testcases = testcases if testcases is not None else self.client.get_testcases(self.project_name, self.run_id)
+    by_id = {t.input_id: t for t in testcases}
+    return [by_id[input_id] for input_id in greedy_set_cover(self.coverage(testcases))]
+
+  def pack(self, testcases: List[Testcase], path: Optional[str] = None) -> PackedCorpus:
+    """Fetch the inputs of `testcases` concurrently into a PackedCorpus, saved to `path` if given."""
+    fetch = lambda t: self.client.get_testcase_input(self.project_name, self.run_id, t.input_id)
+    corpus = PackedCorpus()
+    with ThreadPoolExecutor(self.fetch_workers) as pool:
+      for testcase, testcase_input in zip(testcases, pool.map(fetch, testcases)):
+        corpus.add(testcase.input_id, testcase_input)
+    if path is not None: corpus.save(path)
+    return corpus
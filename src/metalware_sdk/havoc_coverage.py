@@ -0,0 +1,177 @@
+from metalware_sdk.havoc_common_schema import *
+from dataclasses import dataclass
+from collections import Counter
+from typing import Optional, List, Dict, Iterable, Iterator
+import struct
+
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+def _iter_bits(bits: int) -> Iterator[int]:
+  while bits:
+    low = bits & -bits
+    yield low.bit_length() - 1
+    bits ^= low
+
+
+class CoverageSet:
+  """Set of block addresses stored as 64K-bit chunks keyed by the high address bits.
+
+  Union, intersection and difference work chunk by chunk on Python ints, so
+  they cost one big-int operation per 64 KiB of address space instead of one
+  per block.
+  """
+  __slots__ = ('_chunks',)
+
+  def __init__(self, addresses: Iterable[int] = ()) -> None:
+    self._chunks: Dict[int, int] = {}
+    self.update(addresses)
+
+  @staticmethod
+  def from_run_stats(stats: RunStats) -> 'CoverageSet':
+    return CoverageSet(entry[0] for entry in stats.coverage if entry)
+
+  @staticmethod
+  def union_all(sets: Iterable['CoverageSet']) -> 'CoverageSet':
+    result = CoverageSet()
+    for other in sets: result |= other
+    return result
+
+  def add(self, address: int) -> None:
+    high = address >> CHUNK_BITS
+    self._chunks[high] = self._chunks.get(high, 0) | (1 << (address & CHUNK_MASK))
+
+  def update(self, addresses: Iterable[int]) -> None:
+    # Set bits in per-chunk bytearrays first; OR-ing into a big int per address would copy it each time.
+    pending: Dict[int, bytearray] = {}
+    for address in addresses:
+      high = address >> CHUNK_BITS
+      buf = pending.get(high)
+      if buf is None: buf = pending[high] = bytearray(1 << (CHUNK_BITS - 3))
+      low = address & CHUNK_MASK
+      buf[low >> 3] |= 1 << (low & 7)
+    for high, buf in pending.items():
+      self._chunks[high] = self._chunks.get(high, 0) | int.from_bytes(buf, 'little')
+
+  def count_range(self, start: int, end: int) -> int:
+    """Number of addresses in [start, end)."""
+    if end <= start: return 0
+    count = 0
+    for high in range(start >> CHUNK_BITS, ((end - 1) >> CHUNK_BITS) + 1):
+      bits = self._chunks.get(high)
+      if not bits: continue
+      lo = max(start - (high << CHUNK_BITS), 0)
+      hi = min(end - (high << CHUNK_BITS), 1 << CHUNK_BITS)
+      count += ((bits >> lo) & ((1 << (hi - lo)) - 1)).bit_count()
+    return count
+
+  def __contains__(self, address: int) -> bool:
+    return bool(self._chunks.get(address >> CHUNK_BITS, 0) >> (address & CHUNK_MASK) & 1)
+
+  def __len__(self) -> int:
+    return sum(bits.bit_count() for bits in self._chunks.values())
+
+  def __iter__(self) -> Iterator[int]:
+    for high in sorted(self._chunks):
+      base = high << CHUNK_BITS
+      for low in _iter_bits(self._chunks[high]): yield base + low
+
+  def __eq__(self, other: object) -> bool:
+    return isinstance(other, CoverageSet) and self._chunks == other._chunks
+
+  def __repr__(self) -> str:
+    return f"CoverageSet({len(self)} blocks)"
+
+  def _combine(self, other: 'CoverageSet', op, keys) -> 'CoverageSet':
+    result = CoverageSet()
+    for high in keys:
+      bits = op(self._chunks.get(high, 0), other._chunks.get(high, 0))
+      if bits: result._chunks[high] = bits
+    return result
+
+  def __or__(self, other: 'CoverageSet') -> 'CoverageSet':
+    return self._combine(other, int.__or__, self._chunks.keys() | other._chunks.keys())
+
+  def __ior__(self, other: 'CoverageSet') -> 'CoverageSet':
+    for high, bits in other._chunks.items():
+      self._chunks[high] = self._chunks.get(high, 0) | bits
+    return self
+
+  def __and__(self, other: 'CoverageSet') -> 'CoverageSet':
+    return self._combine(other, int.__and__, self._chunks.keys() & other._chunks.keys())
+
+  def __sub__(self, other: 'CoverageSet') -> 'CoverageSet':
+    return self._combine(other, lambda a, b: a & ~b, self._chunks.keys())
+
+  def __xor__(self, other: 'CoverageSet') -> 'CoverageSet':
+    return self._combine(other, int.__xor__, self._chunks.keys() | other._chunks.keys())
+
+  def to_bytes(self) -> bytes:
+    out = [struct.pack('<I', len(self._chunks))]
+    for high in sorted(self._chunks):
+      bitmap = self._chunks[high].to_bytes((1 << CHUNK_BITS) // 8, 'little').rstrip(b'\x00')
+      out.append(struct.pack('<QI', high, len(bitmap)))
+      out.append(bitmap)
+    return b''.join(out)
+
+  @staticmethod
+  def from_bytes(data: bytes) -> 'CoverageSet':
+    result = CoverageSet()
+    (count,) = struct.unpack_from('<I', data, 0)
+    offset = 4
+    for _ in range(count):
+      high, size = struct.unpack_from('<QI', data, offset)
+      offset += 12
+      result._chunks[high] = int.from_bytes(data[offset:offset + size], 'little')
+      offset += size
+    return result
+
+
+def merge_block_frequencies(stats: Iterable[RunStats]) -> Dict[int, int]:
+  """Sum `block_frequency_map` hit counts across runs."""
+  total: Counter = Counter()
+  for s in stats:
+    for entry in s.block_frequency_map:
+      if len(entry) >= 2: total[entry[0]] += entry[1]
+  return dict(total)
+
+
+@dataclass
+class CoverageDiff:
+  added: CoverageSet
+  removed: CoverageSet
+  common: CoverageSet
+
+  @staticmethod
+  def compute(old: CoverageSet, new: CoverageSet) -> 'CoverageDiff':
+    return CoverageDiff(new - old, old - new, old & new)
+
+
+@dataclass
+class SymbolCoverage:
+  name: str
+  address: int
+  size: int
+  covered_blocks: int
+  total_blocks: Optional[int]
+
+  @property
+  def percent(self) -> Optional[float]:
+    if not self.total_blocks: return None
+    return 100.0 * self.covered_blocks / self.total_blocks
+
+
+def symbol_coverage(covered: CoverageSet, symbols: List[Symbol], universe: Optional[CoverageSet] = None) -> List[SymbolCoverage]:
+  """Covered blocks per symbol.
+
+  `universe` is every known block of the image, for example the union over all
+  runs. It is the denominator for `percent`. Without it, `total_blocks` is None.
+  """
+  result = []
+  for symbol in symbols:
+    if symbol.size == 0: continue
+    start = symbol.address & ~1  # Thumb function symbols have bit 0 set.
+    end = start + symbol.size
+    total = universe.count_range(start, end) if universe is not None else None
+    result.append(SymbolCoverage(symbol.name, start, symbol.size, covered.count_range(start, end), total))
+  return result
@@ -0,0 +1,92 @@
+from metalware_sdk.havoc_client import HavocClient
+from metalware_sdk.replay_debugger import ReplayDebugger
+from metalware_sdk.havoc_disasm import DisassemblyCache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, List, Dict, Callable, Iterable, Iterator, TypeVar
+import threading
+
+T = TypeVar('T')
+
+class DebugSessionManager:
+  """Runs ReplayDebugger sessions of one run on a thread pool.
+
+  Sessions are opened on first use and reused afterwards; each has a lock, so
+  one testcase is only driven by one thread at a time. At most `max_sessions`
+  are kept, least recently used first out. The server has no command to end a
+  debug session, so closing a session only drops it on the client side.
+  All sessions share one DisassemblyCache; by default it is restricted to the
+  ROM of the project's memory map, so code in RAM is always fetched again.
+  """
+
+  def __init__(self, client: HavocClient, project_name: str, run_id: int, max_workers: int = 8, max_sessions: int = 64,
+               disasm_cache: Optional[DisassemblyCache] = None):
+    self.client = client
+    self.project_name = project_name
+    self.run_id = run_id
+    if disasm_cache is None:
+      disasm_cache = DisassemblyCache(client.get_project_config(project_name).device_config.memory_map())
+    self.disasm_cache = disasm_cache
+    self.max_sessions = max(max_sessions, max_workers)
+    self._pool = ThreadPoolExecutor(max_workers)
+    self._lock = threading.Lock()
+    self._sessions: 'OrderedDict[str, Tuple[ReplayDebugger, threading.Lock]]' = OrderedDict()
+
+  def __enter__(self) -> 'DebugSessionManager':
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  def _entry(self, testcase_id: str) -> Tuple[ReplayDebugger, threading.Lock]:
+    with self._lock:
+      entry = self._sessions.get(testcase_id)
+      if entry is not None:
+        self._sessions.move_to_end(testcase_id)
+        return entry
+    # Starting a session is a server round trip; do it outside the manager lock.
+    debugger = ReplayDebugger(self.client, self.project_name, self.run_id, testcase_id, self.disasm_cache)
+    entry = (debugger, threading.Lock())
+    with self._lock:
+      entry = self._sessions.setdefault(testcase_id, entry)
+      self._sessions.move_to_end(testcase_id)
+      while len(self._sessions) > self.max_sessions:
+        self._sessions.popitem(last=False)
+    return entry
+
+  def session(self, testcase_id: str) -> ReplayDebugger:
+    """The (possibly reused) session for `testcase_id`. Not locked; prefer `call` from several threads."""
+    return self._entry(testcase_id)[0]
+
+  def call(self, testcase_id: str, fn: Callable[[ReplayDebugger], T], rewind: bool = True) -> T:
+    """Run `fn` on the testcase's session while holding its lock, rewinding a reused session first."""
+    with self._lock: reused = testcase_id in self._sessions
+    debugger, lock = self._entry(testcase_id)
+    with lock:
+      if rewind and reused: debugger.rewind()
+      return fn(debugger)
+
+  def imap(self, fn: Callable[[ReplayDebugger], T], testcase_ids: Iterable[str], rewind: bool = True,
+           return_exceptions: bool = False) -> Iterator[Tuple[str, T]]:
+    """(testcase_id, fn(session)) pairs in input order, computed concurrently."""
+    testcase_ids = list(testcase_ids)
+    futures = [self._pool.submit(self.call, testcase_id, fn, rewind) for testcase_id in testcase_ids]
+    for testcase_id, future in zip(testcase_ids, futures):
+      try:
+        yield testcase_id, future.result()
+      except Exception as e:
+        if not return_exceptions:
+          for pending in futures: pending.cancel()
+          raise
+        yield testcase_id, e
+
+  def map(self, fn: Callable[[ReplayDebugger], T], testcase_ids: Iterable[str], rewind: bool = True,
+          return_exceptions: bool = False) -> Dict[str, T]:
+    return dict(self.imap(fn, testcase_ids, rewind, return_exceptions))
+
+  def close_session(self, testcase_id: str) -> None:
+    with self._lock: self._sessions.pop(testcase_id, None)
+
+  def close(self) -> None:
+    self._pool.shutdown(wait=True, cancel_futures=True)
+    with self._lock: self._sessions.clear()
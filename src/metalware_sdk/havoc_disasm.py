@@ -0,0 +1,128 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_elf import load_elf
+from metalware_sdk.havoc_memory_map import MemoryMap
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Optional, Tuple, List, Dict, Callable
+import threading
+
+try:
+  import capstone
+except ImportError:
+  capstone = None
+
+class ImageBytes:
+  """Locally known firmware bytes, as (load address, data) segments."""
+
+  def __init__(self, segments: List[Tuple[int, bytes]]):
+    self.segments = sorted(segments)
+    self._starts = [address for address, _ in self.segments]
+
+  @staticmethod
+  def from_elf(path: str) -> 'ImageBytes':
+    elf = load_elf(path)
+    with open(path, 'rb') as f: data = f.read()
+    return ImageBytes([(s.vaddr, data[s.offset:s.offset + s.filesz]) for s in elf.segments if s.filesz])
+
+  @staticmethod
+  def from_image_config(image_config: ImageConfig, files: Dict[str, str]) -> 'ImageBytes':
+    """Bytes of an image from local copies of its files; `files` maps file hashes to paths."""
+    image_format = image_config.image_format
+    if image_format.elf is not None:
+      if image_format.elf not in files: raise FileNotFoundError(f"No local file for ELF {image_format.elf}")
+      return ImageBytes.from_elf(files[image_format.elf])
+    segments = []
+    for segment in image_format.raw.segments if image_format.raw is not None else []:
+      if segment.hash not in files: raise FileNotFoundError(f"No local file for segment {segment.hash}")
+      with open(files[segment.hash], 'rb') as f: segments.append((segment.address, f.read()))
+    return ImageBytes(segments)
+
+  def read(self, address: int, size: int) -> bytes:
+    """Bytes from `address`, cut short at the end of its segment; empty if unmapped."""
+    i = bisect_right(self._starts, address) - 1
+    if i < 0: return b''
+    base, data = self.segments[i]
+    return data[address - base:address - base + size]
+
+
+def decode_thumb(image: ImageBytes, start_addr: int, count: int) -> Optional[List[list]]:
+  """Decode `count` Cortex-M Thumb instructions with capstone, or None if unavailable or incomplete."""
+  if capstone is None: return None
+  md = capstone.Cs(capstone.CS_ARCH_ARM, capstone.CS_MODE_THUMB | capstone.CS_MODE_MCLASS)
+  code = image.read(start_addr & ~1, 4 * count)
+  result = [[insn.address, f"{insn.mnemonic} {insn.op_str}".strip()] for insn in md.disasm(code, start_addr & ~1, count)]
+  return result if len(result) == count else None
+
+
+class DisassemblyCache:
+  """Disassembly shared across debugger sessions, keyed by image and address.
+
+  Each image key (a file hash, or anything that identifies immutable code)
+  maps instruction addresses to their text and the address of the next
+  listed instruction, so a range is served by following that chain. With a
+  `memory_map`, only instructions in ROM are cached. Images registered with
+  `add_image` are decoded locally when capstone is installed. At most
+  `max_instructions` are kept; the least recently used image is dropped first.
+  """
+
+  def __init__(self, memory_map: Optional[MemoryMap] = None, max_instructions: int = 1_000_000):
+    self.memory_map = memory_map
+    self.max_instructions = max_instructions
+    self._lock = threading.Lock()
+    self._images: Dict[str, ImageBytes] = {}
+    self._entries: 'OrderedDict[str, Dict[int, Tuple[str, Optional[int]]]]' = OrderedDict()
+    self._size = 0
+
+  def add_image(self, image_key: str, image: ImageBytes) -> None:
+    with self._lock: self._images[image_key] = image
+
+  def _cacheable(self, address: int) -> bool:
+    return self.memory_map is None or self.memory_map.memory_type(address) == MemoryType.ROM
+
+  def get(self, image_key: str, start_addr: int, count: int) -> Optional[List[list]]:
+    with self._lock:
+      entries = self._entries.get(image_key)
+      if entries is None: return None
+      result, address = [], start_addr
+      while len(result) < count:
+        entry = entries.get(address) if address is not None else None
+        if entry is None: return None
+        result.append([address, entry[0]])
+        address = entry[1]
+      self._entries.move_to_end(image_key)
+      return result
+
+  def put(self, image_key: str, instructions: List[list]) -> None:
+    """Store a contiguous listing of (address, text) pairs."""
+    with self._lock:
+      entries = self._entries.setdefault(image_key, {})
+      self._entries.move_to_end(image_key)
+      for i, (address, text) in enumerate(instructions):
+        if not self._cacheable(address): continue
+        next_address = instructions[i + 1][0] if i + 1 < len(instructions) else None
+        old = entries.get(address)
+        if old is not None and next_address is None: next_address = old[1]
+        if old is None: self._size += 1
+        entries[address] = (text, next_address)
+      while self._size > self.max_instructions and len(self._entries) > 1:
+        _, dropped = self._entries.popitem(last=False)
+        self._size -= len(dropped)
+
+  def disassemble_range(self, image_key: str, start_addr: int, count: int,
+                        fetch: Callable[[int, int], List[list]]) -> List[list]:
+    """Cached listing if complete, else a local decode, else `fetch(start_addr, count)` from the server."""
+    result = self.get(image_key, start_addr, count)
+    if result is not None: return result
+    image = self._images.get(image_key)
+    result = decode_thumb(image, start_addr, count) if image is not None else None
+    if result is None: result = fetch(start_addr, count)
+    self.put(image_key, result)
+    return result
+
+  def clear(self, image_key: Optional[str] = None) -> None:
+    with self._lock:
+      if image_key is None:
+        self._entries.clear()
+        self._size = 0
+      elif image_key in self._entries:
+        self._size -= len(self._entries.pop(image_key))
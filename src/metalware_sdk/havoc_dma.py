@@ -0,0 +1,148 @@
+from metalware_sdk.havoc_common_schema import *
+from array import array
+from collections import deque
+from typing import Optional, Tuple, List, Dict, Any
+
+HEAD, FIELD, ENTRY = 0, 1, 2
+NONE = -1
+
+def _hex(value: Any) -> int:
+  return int(value.replace("+", ""), 16) if isinstance(value, str) else value
+
+
+class StringPool:
+  """Interns type and typedef names; share one pool across polls to keep ids stable."""
+
+  def __init__(self) -> None:
+    self.strings: List[str] = []
+    self._ids: Dict[str, int] = {}
+
+  def intern(self, s: Optional[str]) -> int:
+    if s is None: return NONE
+    i = self._ids.get(s)
+    if i is None:
+      i = self._ids[s] = len(self.strings)
+      self.strings.append(s)
+    return i
+
+  def get(self, i: int) -> Optional[str]:
+    return self.strings[i] if i != NONE else None
+
+
+class DMADescriptorTable:
+  """Flat, array-backed form of a DMAConfig descriptor graph.
+
+  Node i is a descriptor head, a pointed-to field or a field entry. Entries of
+  one `fields` list are stored contiguously from `first_child[i]`. `target[i]`
+  is the node a `to` pointer leads to. Rarely present attributes live in
+  dicts keyed by node. Decoding is breadth-first and needs no recursion.
+  """
+
+  def __init__(self, pool: Optional[StringPool] = None) -> None:
+    self.pool = pool or StringPool()
+    self.kind = array('b')
+    self.parent = array('i')
+    self.offset = array('q')
+    self.type_id = array('i')
+    self.typedef_id = array('i')
+    self.target = array('i')
+    self.first_child = array('i')
+    self.child_count = array('i')
+    self.mask: Dict[int, int] = {}
+    self.size: Dict[int, int] = {}
+    self.is_buf_end_ptr: Dict[int, bool] = {}
+    self.known_values: Dict[int, List[Union[int, str]]] = {}
+    self.known_sizes: Dict[int, Dict[str, Any]] = {}
+    self.buffers: Dict[int, Tuple[int, int]] = {}
+    self.heads: Dict[int, int] = {}
+    self._by_offset: Dict[Tuple[int, int], int] = {}
+
+  def __len__(self) -> int:
+    return len(self.kind)
+
+  def _add(self, kind: int, parent: int, obj: dict) -> int:
+    i = len(self.kind)
+    self.kind.append(kind)
+    self.parent.append(parent)
+    self.offset.append(obj.get("offset", NONE) if kind == ENTRY else NONE)
+    self.type_id.append(self.pool.intern(obj.get("type")))
+    self.typedef_id.append(self.pool.intern(obj.get("typedef")))
+    self.target.append(NONE)
+    self.first_child.append(NONE)
+    self.child_count.append(0)
+    for name, store in (("mask", self.mask), ("size", self.size), ("is_buf_end_ptr", self.is_buf_end_ptr),
+                        ("known_values", self.known_values), ("known_sizes", self.known_sizes)):
+      value = obj.get(name)
+      if value is not None: store[i] = value
+    return i
+
+  @staticmethod
+  def from_dict(obj: Any, pool: Optional[StringPool] = None) -> 'DMADescriptorTable':
+    """Build from the raw `dma_config` JSON object."""
+    assert isinstance(obj, dict)
+    table = DMADescriptorTable(pool)
+    for addr, srange in (obj.get("buffers") or {}).items():
+      table.buffers[_hex(addr)] = (_hex(srange["min"]), _hex(srange["max"]))
+
+    pending: deque = deque()
+    for head in obj.get("descriptors") or []:
+      i = table._add(HEAD, NONE, head)
+      table.heads[_hex(head["addr"])] = i
+      pending.append((i, head))
+    while pending:
+      i, node = pending.popleft()
+      to = node.get("to")
+      if to is not None:
+        j = table._add(FIELD, i, to)
+        table.target[i] = j
+        pending.append((j, to))
+      fields = node.get("fields")
+      if fields:
+        table.first_child[i] = len(table.kind)
+        table.child_count[i] = len(fields)
+        for entry in fields:
+          j = table._add(ENTRY, i, entry)
+          table._by_offset[(i, table.offset[j])] = j
+          pending.append((j, entry))
+    return table
+
+  @staticmethod
+  def from_run_stats(stats: Union[RunStats, LazyRunStats], pool: Optional[StringPool] = None) -> 'DMADescriptorTable':
+    if isinstance(stats, LazyRunStats): return DMADescriptorTable.from_dict(stats.raw["dma_config"], pool)
+    return DMADescriptorTable.from_dict(stats.dma_config.to_dict(), pool)
+
+  def children(self, i: int) -> range:
+    first = self.first_child[i]
+    return range(first, first + self.child_count[i]) if first != NONE else range(0)
+
+  def type_name(self, i: int) -> Optional[str]:
+    return self.pool.get(self.type_id[i])
+
+  def typedef(self, i: int) -> Optional[str]:
+    return self.pool.get(self.typedef_id[i])
+
+  def field_at(self, i: int, offset: int) -> int:
+    """Entry at `offset` among the fields of node i (or of the node it points to), or -1."""
+    j = self._by_offset.get((i, offset), NONE)
+    if j == NONE and self.target[i] != NONE: j = self._by_offset.get((self.target[i], offset), NONE)
+    return j
+
+  def lookup(self, addr: int, offset: int) -> int:
+    """Field entry at `offset` inside the descriptor whose head is at `addr`, or -1."""
+    head = self.heads.get(addr)
+    return self.field_at(head, offset) if head is not None else NONE
+
+
+class DMATableCache:
+  """Reuses the table across RunStats polls while the raw `dma_config` is unchanged."""
+
+  def __init__(self) -> None:
+    self.pool = StringPool()
+    self._raw: Optional[dict] = None
+    self._table: Optional[DMADescriptorTable] = None
+
+  def get(self, raw: dict) -> DMADescriptorTable:
+    if self._table is None or (raw is not self._raw and raw != self._raw):
+      self._table = DMADescriptorTable.from_dict(raw, self.pool)
+      self._raw = raw
+    return self._table
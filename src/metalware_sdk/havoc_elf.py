@@ -0,0 +1,173 @@
+from metalware_sdk.havoc_common_schema import *
+from dataclasses import dataclass
+from typing import Optional, Tuple, List, Dict
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+PT_LOAD = 1
+PF_W = 0x2
+SHT_SYMTAB = 2
+STT_OBJECT, STT_FUNC = 1, 2
+
+# ARMv7-M peripheral region.
+CORTEX_M_PERIPHERALS = Memory(base_addr=0x40000000, size=0x20000000, memory_type=MemoryType.MMIO)
+REGION_ALIGN = 0x1000
+REGION_MERGE_GAP = 0x10000
+
+@dataclass
+class ElfSegment:
+  offset: int
+  vaddr: int
+  paddr: int
+  filesz: int
+  memsz: int
+  flags: int
+
+@dataclass
+class ElfSection:
+  name: str
+  type: int
+  addr: int
+  offset: int
+  size: int
+  link: int
+  entsize: int
+
+@dataclass
+class ElfFile:
+  hash: str
+  entry: int
+  is_64: bool
+  little_endian: bool
+  segments: List[ElfSegment]
+  sections: List[ElfSection]
+  symbols: List[Symbol]
+  initial_sp: Optional[int]
+
+  def section(self, name: str) -> Optional[ElfSection]:
+    return next((s for s in self.sections if s.name == name), None)
+
+
+def _parse(data: bytes, file_hash: str) -> ElfFile:
+  if data[:4] != b'\x7fELF': raise ValueError("Not an ELF file")
+  is_64 = data[4] == 2
+  e = '<' if data[5] == 1 else '>'
+  if is_64:
+    entry, phoff, shoff = struct.unpack_from(e + 'QQQ', data, 24)
+    phentsize, phnum, shentsize, shnum, shstrndx = struct.unpack_from(e + 'HHHHH', data, 54)
+  else:
+    entry, phoff, shoff = struct.unpack_from(e + 'III', data, 24)
+    phentsize, phnum, shentsize, shnum, shstrndx = struct.unpack_from(e + 'HHHHH', data, 42)
+
+  segments = []
+  for i in range(phnum):
+    off = phoff + i * phentsize
+    if is_64:
+      p_type, flags, offset, vaddr, paddr, filesz, memsz = struct.unpack_from(e + 'IIQQQQQ', data, off)
+    else:
+      p_type, offset, vaddr, paddr, filesz, memsz, flags = struct.unpack_from(e + 'IIIIIII', data, off)
+    if p_type == PT_LOAD: segments.append(ElfSegment(offset, vaddr, paddr, filesz, memsz, flags))
+
+  raw_sections = []
+  for i in range(shnum):
+    off = shoff + i * shentsize
+    if is_64:
+      name, sh_type, _, addr, offset, size, link, _, _, entsize = struct.unpack_from(e + 'IIQQQQIIQQ', data, off)
+    else:
+      name, sh_type, _, addr, offset, size, link, _, _, entsize = struct.unpack_from(e + 'IIIIIIIIII', data, off)
+    raw_sections.append((name, sh_type, addr, offset, size, link, entsize))
+
+  def cstr(table_offset: int, index: int) -> str:
+    start = table_offset + index
+    return data[start:data.find(b'\x00', start)].decode('utf-8', 'replace')
+
+  shstrtab_offset = raw_sections[shstrndx][3] if 0 < shstrndx < len(raw_sections) else None
+  sections = [ElfSection(cstr(shstrtab_offset, n) if shstrtab_offset is not None else '', t, a, o, s, l, es)
+              for (n, t, a, o, s, l, es) in raw_sections]
+
+  symbols = []
+  for section in sections:
+    if section.type != SHT_SYMTAB or not section.entsize: continue
+    strtab_offset = sections[section.link].offset
+    for off in range(section.offset, section.offset + section.size, section.entsize):
+      if is_64:
+        name, info, _, shndx, value, size = struct.unpack_from(e + 'IBBHQQ', data, off)
+      else:
+        name, value, size, info, _, shndx = struct.unpack_from(e + 'IIIBBH', data, off)
+      if info & 0xf in (STT_FUNC, STT_OBJECT) and name and shndx:
+        symbols.append(Symbol(value, cstr(strtab_offset, name), size))
+
+  initial_sp = None
+  vectors = next((s for s in sections if s.name in ('.isr_vector', '.vectors')), None)
+  if vectors is not None and vectors.size >= 4:
+    initial_sp = struct.unpack_from(e + 'I', data, vectors.offset)[0]
+
+  return ElfFile(file_hash, entry, is_64, e == '<', segments, sections, symbols, initial_sp)
+
+
+_cache: Dict[str, ElfFile] = {}
+_cache_lock = threading.Lock()
+
+def load_elf(path: str) -> ElfFile:
+  """Parse an ELF file through mmap. Results are cached by the file's SHA-256."""
+  if not os.path.exists(path): raise FileNotFoundError(f"File not found: {path}")
+  with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+    file_hash = hashlib.sha256(data).hexdigest()
+    with _cache_lock:
+      if file_hash in _cache: return _cache[file_hash]
+    elf = _parse(data, file_hash)
+  with _cache_lock: _cache[file_hash] = elf
+  return elf
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+  merged: List[List[int]] = []
+  for start, end in sorted(ranges):
+    start = start & ~(REGION_ALIGN - 1)
+    end = (end + REGION_ALIGN - 1) & ~(REGION_ALIGN - 1)
+    if merged and start <= merged[-1][1] + REGION_MERGE_GAP: merged[-1][1] = max(merged[-1][1], end)
+    else: merged.append([start, end])
+  return [(start, end) for start, end in merged]
+
+
+def infer_config(path: str, file_hash: Optional[str] = None) -> Tuple[DeviceConfig, ImageConfig, List[Symbol]]:
+  """Infer a device and image config from a Cortex-M ELF without contacting the server.
+
+  Load images (physical addresses) become ROM backed by the file, writable
+  segments become RAM, extended up to the initial stack pointer, and the ARMv7-M
+  peripheral range is MMIO. The entry address is the vector table. `file_hash`
+  should be the hash the server reports for the uploaded file; it defaults to
+  the local SHA-256.
+  """
+  elf = load_elf(path)
+  file_hash = file_hash or elf.hash
+
+  rom_segments = [s for s in elf.segments if s.filesz > 0]
+  rom = _merge([(s.paddr, s.paddr + s.filesz) for s in rom_segments])
+  ram = _merge([(s.vaddr, s.vaddr + s.memsz) for s in elf.segments if s.flags & PF_W and s.memsz > 0])
+  if elf.initial_sp is not None:
+    ram = [(start, max(end, elf.initial_sp) if start <= elf.initial_sp < start + 0x1000000 else end) for start, end in ram]
+
+  layout = []
+  for start, end in rom:
+    segments = [MemoryFileSegment(s.offset, s.paddr - start, s.filesz) for s in rom_segments if start <= s.paddr < end]
+    layout.append(Memory(base_addr=start, size=end - start, memory_type=MemoryType.ROM, file=MemoryFile(file_hash, segments)))
+  for start, end in ram:
+    if not any(start < r_end and r_start < end for r_start, r_end in rom):
+      layout.append(Memory(base_addr=start, size=end - start, memory_type=MemoryType.RAM))
+  layout.append(Memory(CORTEX_M_PERIPHERALS.base_addr, CORTEX_M_PERIPHERALS.size, CORTEX_M_PERIPHERALS.memory_type))
+
+  vectors = elf.section('.isr_vector') or elf.section('.vectors')
+  entry_address = vectors.addr if vectors is not None else (rom[0][0] if rom else elf.entry & ~1)
+  image_config = ImageConfig(
+    entry_address=entry_address,
+    image_arch=ImageArch.CORTEX_M,
+    image_format=ImageFormat(elf=file_hash),
+    patches=[],
+    symbols=list(elf.symbols),
+    handlers=[]
+  )
+  return DeviceConfig(layout), image_config, list(elf.symbols)
@@ -0,0 +1,83 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Tuple, List, Dict, Iterable
+import time
+
+class RunSnapshot(Record):
+  """One run in a fleet snapshot. Stats counts are -1 when stats were not fetched."""
+  __slots__ = ('project_name', 'run_id', 'status', 'created_at', 'modified_at', 'executions', 'throughput',
+               'num_crashes', 'num_hangs', 'num_covered_blocks')
+  project_name: str
+  run_id: int
+  status: RunStatus
+  created_at: int
+  modified_at: int
+  executions: int
+  throughput: int
+  num_crashes: int
+  num_hangs: int
+  num_covered_blocks: int
+
+  def __init__(self, project_name: str, run_id: int, status: RunStatus, created_at: int, modified_at: int, executions: int = -1,
+               throughput: int = -1, num_crashes: int = -1, num_hangs: int = -1, num_covered_blocks: int = -1) -> None:
+    self.project_name = project_name
+    self.run_id = run_id
+    self.status = status
+    self.created_at = created_at
+    self.modified_at = modified_at
+    self.executions = executions
+    self.throughput = throughput
+    self.num_crashes = num_crashes
+    self.num_hangs = num_hangs
+    self.num_covered_blocks = num_covered_blocks
+
+  def __repr__(self) -> str:
+    return f"RunSnapshot({self.project_name}/{self.run_id}, {self.status.value}, executions={self.executions}, crashes={self.num_crashes})"
+
+
+@dataclass
+class FleetSnapshot:
+  taken_at: float
+  runs: List[RunSnapshot]
+
+  def by_project(self) -> Dict[str, List[RunSnapshot]]:
+    projects: Dict[str, List[RunSnapshot]] = {}
+    for run in self.runs: projects.setdefault(run.project_name, []).append(run)
+    return projects
+
+  def by_status(self) -> Dict[RunStatus, int]:
+    counts: Dict[RunStatus, int] = {}
+    for run in self.runs: counts[run.status] = counts.get(run.status, 0) + 1
+    return counts
+
+  def total_throughput(self) -> int:
+    return sum(run.throughput for run in self.runs if run.status == RunStatus.RUNNING and run.throughput > 0)
+
+
+def fleet_snapshot(client: HavocClient, projects: Optional[Iterable[str]] = None, max_workers: int = 16,
+                   include_stats: bool = True, coverage: bool = False) -> FleetSnapshot:
+  """Summaries, and optionally stats counts, of every run of `projects` (default: all projects).
+
+  Requests are issued on at most `max_workers` threads. The API has no bulk
+  stats endpoint, so stats cost one request per run; only the fields needed
+  for the counts are requested, and `coverage=True` adds the coverage list.
+  """
+  taken_at = time.time()
+  project_names = list(projects) if projects is not None else [name for name, _ in client.get_projects()]
+  fields = ['executions', 'throughput', 'crashes', 'hangs'] + (['coverage'] if coverage else [])
+
+  def snapshot(item: Tuple[str, int, RunSummary]) -> RunSnapshot:
+    project_name, run_id, summary = item
+    if not include_stats or summary.status == RunStatus.PENDING:
+      return RunSnapshot(project_name, run_id, summary.status, summary.created_at, summary.modified_at)
+    raw = client.get_run_stats(project_name, run_id, fields=fields).raw
+    return RunSnapshot(project_name, run_id, summary.status, summary.created_at, summary.modified_at,
+                       raw.get('executions', -1), raw.get('throughput', -1), len(raw.get('crashes') or ()),
+                       len(raw.get('hangs') or ()), len(raw.get('coverage') or ()) if coverage else -1)
+
+  with ThreadPoolExecutor(max_workers) as pool:
+    runs_per_project = pool.map(client.get_runs, project_names)
+    items = [(name, run_id, summary) for name, runs in zip(project_names, runs_per_project) for run_id, summary in runs]
+    return FleetSnapshot(taken_at, list(pool.map(snapshot, items)))
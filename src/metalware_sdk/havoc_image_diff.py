@@ -0,0 +1,65 @@
+from metalware_sdk.havoc_common_schema import *
+from dataclasses import dataclass, field
+from typing import Optional, List, TypeVar
+
+T = TypeVar("T")
+
+def _added(old: List[T], new: List[T]) -> List[T]:
+  seen = set(old)
+  return [x for x in new if x not in seen]
+
+
+@dataclass
+class ImageConfigDiff:
+  """Minimal change set between two ImageConfigs. Scalar fields are None when unchanged."""
+  entry_address: Optional[int] = None
+  image_arch: Optional[ImageArch] = None
+  image_format: Optional[ImageFormat] = None
+  added_patches: List[Patch] = field(default_factory=list)
+  removed_patches: List[Patch] = field(default_factory=list)
+  added_symbols: List[Symbol] = field(default_factory=list)
+  removed_symbols: List[Symbol] = field(default_factory=list)
+  added_handlers: List[Handler] = field(default_factory=list)
+  removed_handlers: List[Handler] = field(default_factory=list)
+  handlers_cleared: bool = False
+
+  @staticmethod
+  def compute(old: ImageConfig, new: ImageConfig) -> 'ImageConfigDiff':
+    old_handlers, new_handlers = old.handlers or [], new.handlers or []
+    return ImageConfigDiff(
+      entry_address=new.entry_address if new.entry_address != old.entry_address else None,
+      image_arch=new.image_arch if new.image_arch != old.image_arch else None,
+      image_format=new.image_format if new.image_format.to_dict() != old.image_format.to_dict() else None,
+      added_patches=_added(old.patches, new.patches),
+      removed_patches=_added(new.patches, old.patches),
+      added_symbols=_added(old.symbols, new.symbols),
+      removed_symbols=_added(new.symbols, old.symbols),
+      added_handlers=_added(old_handlers, new_handlers),
+      removed_handlers=_added(new_handlers, old_handlers),
+      handlers_cleared=new.handlers is None and old.handlers is not None,
+    )
+
+  def is_empty(self) -> bool:
+    return (self.entry_address is None and self.image_arch is None and self.image_format is None
+            and not self.added_patches and not self.removed_patches
+            and not self.added_symbols and not self.removed_symbols
+            and not self.added_handlers and not self.removed_handlers and not self.handlers_cleared)
+
+  def apply(self, config: ImageConfig) -> ImageConfig:
+    """Return a new ImageConfig with this diff applied to `config`."""
+    def patch_list(items: List[T], added: List[T], removed: List[T]) -> List[T]:
+      removed_set = set(removed)
+      return [x for x in items if x not in removed_set] + _added(items, added)
+
+    handlers = None
+    if not self.handlers_cleared:
+      handlers = patch_list(config.handlers or [], self.added_handlers, self.removed_handlers)
+      if config.handlers is None and not handlers: handlers = None
+    return ImageConfig(
+      entry_address=self.entry_address if self.entry_address is not None else config.entry_address,
+      image_arch=self.image_arch if self.image_arch is not None else config.image_arch,
+      image_format=self.image_format if self.image_format is not None else config.image_format,
+      patches=patch_list(config.patches, self.added_patches, self.removed_patches),
+      symbols=patch_list(config.symbols, self.added_symbols, self.removed_symbols),
+      handlers=handlers,
+    )
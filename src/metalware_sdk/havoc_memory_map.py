@@ -0,0 +1,98 @@
+from metalware_sdk.havoc_common_schema import *
+from bisect import bisect_right
+from typing import Optional, Tuple, List, Iterable
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+class _Intervals:
+  """Sorted, non-overlapping regions with O(log n) point lookup."""
+
+  def __init__(self, regions: List[Memory]):
+    self.regions = sorted(regions, key=lambda m: m.base_addr)
+    self.starts = [m.base_addr for m in self.regions]
+    self.ends = [m.base_addr + m.size for m in self.regions]
+
+  def index_of(self, address: int) -> int:
+    i = bisect_right(self.starts, address) - 1
+    return i if i >= 0 and address < self.ends[i] else -1
+
+  def overlaps(self) -> List[Tuple[Memory, Memory]]:
+    return [(self.regions[i - 1], self.regions[i]) for i in range(1, len(self.regions)) if self.starts[i] < self.ends[i - 1]]
+
+
+class MemoryMap:
+  """Validated address index over a DeviceConfig memory layout.
+
+  IO_OVERLAY regions take precedence over the regions they overlay. Every
+  other region must be disjoint. Construction raises ValueError on
+  overlapping regions, `aliased_to` targets that are unmapped or form a
+  cycle, and MemoryFile segments that extend past their region.
+  """
+  TYPES = list(MemoryType)
+
+  def __init__(self, memory_layout: List[Memory]):
+    self._overlays = _Intervals([m for m in memory_layout if m.memory_type == MemoryType.IO_OVERLAY])
+    self._regions = _Intervals([m for m in memory_layout if m.memory_type != MemoryType.IO_OVERLAY])
+    self.validate()
+
+  @staticmethod
+  def from_device_config(config: DeviceConfig) -> 'MemoryMap':
+    return MemoryMap(config.memory_layout)
+
+  def validate(self) -> None:
+    errors = []
+    for m in self._regions.regions + self._overlays.regions:
+      if m.size <= 0: errors.append(f"region at {hex(m.base_addr)} has size {m.size}")
+      if m.file is not None:
+        for segment in m.file.segments:
+          if segment.memory_offset + segment.size > m.size:
+            errors.append(f"file segment {hex(segment.memory_offset)}+{hex(segment.size)} of {m.file.path} exceeds region at {hex(m.base_addr)} (size {hex(m.size)})")
+    for a, b in self._regions.overlaps() + self._overlays.overlaps():
+      errors.append(f"regions at {hex(a.base_addr)} and {hex(b.base_addr)} overlap")
+    for m in self._regions.regions + self._overlays.regions:
+      if m.aliased_to is None: continue
+      try: self.resolve(m.base_addr)
+      except ValueError as e: errors.append(str(e))
+    if errors: raise ValueError("Invalid memory layout: " + "; ".join(dict.fromkeys(errors)))
+
+  @property
+  def regions(self) -> List[Memory]:
+    return self._overlays.regions + self._regions.regions
+
+  def region_at(self, address: int) -> Optional[Memory]:
+    i = self._overlays.index_of(address)
+    if i >= 0: return self._overlays.regions[i]
+    i = self._regions.index_of(address)
+    return self._regions.regions[i] if i >= 0 else None
+
+  def memory_type(self, address: int) -> Optional[MemoryType]:
+    region = self.region_at(address)
+    return region.memory_type if region is not None else None
+
+  def resolve(self, address: int) -> Tuple[Memory, int]:
+    """Follow `aliased_to` links to the backing region and address."""
+    seen = set()
+    while True:
+      region = self.region_at(address)
+      if region is None: raise ValueError(f"address {hex(address)} is not mapped")
+      if region.aliased_to is None: return region, address
+      if id(region) in seen: raise ValueError(f"alias cycle through region at {hex(region.base_addr)}")
+      seen.add(id(region))
+      address = region.aliased_to + (address - region.base_addr)
+
+  def classify(self, addresses: Iterable[int]) -> List[Optional[MemoryType]]:
+    """Memory type of every address; vectorized with NumPy when it is installed."""
+    if np is None:
+      return [self.memory_type(address) for address in addresses]
+    addrs = np.fromiter(addresses, dtype=np.uint64)
+    codes = np.full(len(addrs), -1, dtype=np.int8)
+    for index in (self._regions, self._overlays):  # Overlays last so they win.
+      if not index.regions: continue
+      i = np.searchsorted(np.array(index.starts, dtype=np.uint64), addrs, side='right').astype(np.int64) - 1
+      hit = (i >= 0) & (addrs < np.array(index.ends, dtype=np.uint64)[np.maximum(i, 0)])
+      types = np.array([MemoryMap.TYPES.index(m.memory_type) for m in index.regions], dtype=np.int8)
+      codes[hit] = types[i[hit]]
+    return [MemoryMap.TYPES[c] if c >= 0 else None for c in codes.tolist()]
@@ -0,0 +1,87 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from dataclasses import dataclass
+from typing import Optional, Tuple, List
+import math
+import time
+
+def fit_discovery_curve(times: List[int]) -> Optional[Tuple[float, float]]:
+  """Least-squares fit of blocks(t) = a + b * ln(1 + t) to block discovery times.
+
+  Returns (a, b), or None if there are fewer than two distinct discovery times.
+  """
+  times = sorted(times)
+  xs = [math.log1p(max(t, 0)) for t in times]
+  n = len(xs)
+  if n < 2: return None
+  mean_x = sum(xs) / n
+  mean_y = (n + 1) / 2
+  sxx = sum((x - mean_x) ** 2 for x in xs)
+  if sxx < 1e-12: return None
+  b = sum((x - mean_x) * (i + 1 - mean_y) for i, x in enumerate(xs)) / sxx
+  return mean_y - b * mean_x, b
+
+
+def expected_time_to_next_block(times: List[int], now: float) -> Optional[float]:
+  """Expected wait for the next new block at time `now`, in the units of `time_to_discover`."""
+  fit = fit_discovery_curve(times)
+  if fit is None: return None
+  _, b = fit
+  # d(blocks)/dt = b / (1 + t), so the next block is expected after (1 + t) / b.
+  return (1 + now) / b if b > 0 else math.inf
+
+
+@dataclass
+class StopDecision:
+  project_name: str
+  run_id: int
+  reason: str
+  blocks: int
+  expected_time_to_next_block: float
+  stopped_at: float
+
+
+class PlateauMonitor:
+  """Stops a run once its coverage curve says the next new block is more than `threshold` away.
+
+  `threshold` and the fitted curve use the units of `Block.time_to_discover`.
+  `time_scale` converts wall-clock seconds into those units.
+  """
+
+  def __init__(self, client: HavocClient, project_name: str, run_id: int, threshold: float,
+               min_blocks: int = 10, time_scale: float = 1.0):
+    self.client = client
+    self.project_name = project_name
+    self.run_id = run_id
+    self.threshold = threshold
+    self.min_blocks = min_blocks
+    self.time_scale = time_scale
+    self.decision: Optional[StopDecision] = None
+    self._blocks = -1
+    self._last_change = time.monotonic()
+
+  def poll(self) -> Optional[StopDecision]:
+    """Check the run once; stops it and returns the decision if it has plateaued."""
+    if self.decision is not None: return self.decision
+    times = [block.time_to_discover for block in self.client.get_run_stats(self.project_name, self.run_id, fields=['new_blocks']).new_blocks]
+    if len(times) != self._blocks:
+      self._blocks = len(times)
+      self._last_change = time.monotonic()
+    if len(times) < self.min_blocks: return None
+
+    now = max(times) + (time.monotonic() - self._last_change) * self.time_scale
+    expected = expected_time_to_next_block(times, now)
+    if expected is None or expected <= self.threshold: return None
+
+    self.client.stop_run(self.project_name, self.run_id)
+    reason = (f"Coverage plateaued at {len(times)} blocks: next block expected in {expected:.0f}"
+              f" (threshold {self.threshold:.0f})")
+    self.decision = StopDecision(self.project_name, self.run_id, reason, len(times), expected, time.time())
+    return self.decision
+
+  def watch(self, interval: float = 60.0) -> Optional[StopDecision]:
+    """Poll until the run plateaus or stops on its own."""
+    while self.client.get_run_status(self.project_name, self.run_id) in (RunStatus.PENDING, RunStatus.RUNNING):
+      if self.poll() is not None: return self.decision
+      time.sleep(interval)
+    return None
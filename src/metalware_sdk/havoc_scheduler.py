@@ -0,0 +1,151 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from dataclasses import dataclass, field
+from collections import deque
+from typing import Optional, Tuple, List, Dict, Deque
+import time
+
+@dataclass
+class Campaign:
+  """One image being fuzzed under a CampaignScheduler."""
+  project_name: str
+  image_name: str
+  fuzzer_config: Optional[FuzzerConfig] = None
+  run_id: Optional[int] = None
+  instance_count: int = 0
+  started_at: float = 0.0
+  finished: bool = False
+  # (monotonic time, len(new_blocks), executions) samples of the current run.
+  samples: Deque[Tuple[float, int, int]] = field(default_factory=deque, repr=False)
+
+  @property
+  def active(self) -> bool:
+    return self.run_id is not None and not self.finished
+
+  def discovery_rate(self) -> Optional[float]:
+    """New blocks per second per fuzzing instance over the sample window."""
+    if len(self.samples) < 2 or self.instance_count == 0: return None
+    (t0, blocks0, _), (t1, blocks1, _) = self.samples[0], self.samples[-1]
+    if t1 <= t0: return None
+    return (blocks1 - blocks0) / (t1 - t0) / self.instance_count
+
+
+def allocate_instances(scores: Dict[int, float], budget: int, min_instances: int = 1) -> Dict[int, int]:
+  """Split `budget` instances proportionally to `scores`; zero-score entries get nothing."""
+  growing = sorted((k for k, s in scores.items() if s > 0), key=lambda k: -scores[k])
+  if not growing or budget <= 0: return {k: 0 for k in scores}
+  min_instances = max(1, min(min_instances, budget))
+  growing = growing[:budget // min_instances]
+  allocation = {k: 0 for k in scores}
+  for k in growing: allocation[k] = min_instances
+  remaining = budget - min_instances * len(growing)
+  total = sum(scores[k] for k in growing)
+  shares = {k: remaining * scores[k] / total for k in growing}
+  for k in growing: allocation[k] += int(shares[k])
+  leftover = remaining - sum(int(v) for v in shares.values())
+  for k in sorted(growing, key=lambda k: int(shares[k]) - shares[k])[:leftover]: allocation[k] += 1
+  return allocation
+
+
+class CampaignScheduler:
+  """Moves a fixed budget of fuzzing instances towards images whose coverage is still growing.
+
+  Every `step` polls the stats of each active run and scores it by its recent
+  block discovery rate per instance. Runs that discovered nothing during the
+  last `window` seconds are stopped for good, and the instances they free go
+  to campaigns not started yet. Runs older than `min_run_time` seconds then
+  share the instances not held by younger runs, proportionally to their score.
+  A run that is still growing is never stopped to make room for another.
+
+  A RunConfig cannot resume a run, so changing a run's instance count restarts
+  it from scratch and discards its corpus and progress. A run is therefore
+  only resized when its new count differs by at least `rebalance_threshold`
+  times its current count (and by at least one instance).
+  """
+
+  def __init__(self, client: HavocClient, core_budget: int, window: float = 600.0, min_run_time: float = 900.0,
+               min_instances: int = 1, rebalance_threshold: float = 0.5):
+    self.client = client
+    self.core_budget = core_budget
+    self.window = window
+    self.min_run_time = min_run_time
+    self.min_instances = min_instances
+    self.rebalance_threshold = rebalance_threshold
+    self.campaigns: List[Campaign] = []
+
+  def add(self, project_name: str, image_name: str, fuzzer_config: Optional[FuzzerConfig] = None) -> Campaign:
+    campaign = Campaign(project_name, image_name, fuzzer_config)
+    self.campaigns.append(campaign)
+    return campaign
+
+  def start(self) -> None:
+    pending = [c for c in self.campaigns if c.run_id is None and not c.finished]
+    allocation = allocate_instances({i: 1.0 for i in range(len(pending))}, self.core_budget - self.used_instances(), self.min_instances)
+    for i, campaign in enumerate(pending):
+      if allocation[i] > 0: self._start(campaign, allocation[i])
+
+  def used_instances(self) -> int:
+    return sum(c.instance_count for c in self.campaigns if c.active)
+
+  def _start(self, campaign: Campaign, instance_count: int) -> None:
+    config = RunConfig(image_name=campaign.image_name, instance_count=instance_count, fuzzer_config=campaign.fuzzer_config)
+    campaign.run_id = self.client.start_run(campaign.project_name, config)
+    campaign.instance_count = instance_count
+    campaign.started_at = time.monotonic()
+    campaign.samples.clear()
+
+  def _stop(self, campaign: Campaign) -> None:
+    self.client.stop_run(campaign.project_name, campaign.run_id)
+    campaign.instance_count = 0
+
+  def _sample(self, campaign: Campaign) -> None:
+    now = time.monotonic()
+    stats = self.client.get_run_stats(campaign.project_name, campaign.run_id, fields=['executions', 'new_blocks'])
+    campaign.samples.append((now, len(stats.new_blocks), stats.executions))
+    while len(campaign.samples) > 2 and campaign.samples[1][0] <= now - self.window:
+      campaign.samples.popleft()
+
+  def _worth_restarting(self, campaign: Campaign, instance_count: int) -> bool:
+    change = abs(instance_count - campaign.instance_count)
+    return change >= max(1, self.rebalance_threshold * campaign.instance_count)
+
+  def step(self) -> Dict[int, int]:
+    """Poll every active run, rebalance and start pending campaigns. Returns the instance count per campaign index."""
+    now = time.monotonic()
+    mature: Dict[int, float] = {}
+    for i, campaign in enumerate(self.campaigns):
+      if not campaign.active: continue
+      if self.client.get_run_status(campaign.project_name, campaign.run_id) not in (RunStatus.PENDING, RunStatus.RUNNING):
+        campaign.instance_count = 0
+        campaign.finished = True
+        continue
+      self._sample(campaign)
+      rate = campaign.discovery_rate()
+      if rate is not None and now - campaign.started_at >= self.min_run_time:
+        mature[i] = rate
+
+    for i in [i for i, rate in mature.items() if rate <= 0]:
+      self._stop(self.campaigns[i])
+      self.campaigns[i].finished = True
+      del mature[i]
+
+    # Freed instances go to campaigns that have not run yet.
+    self.start()
+
+    budget = self.core_budget - sum(c.instance_count for i, c in enumerate(self.campaigns) if c.active and i not in mature)
+    allocation = allocate_instances(mature, budget, self.min_instances) if mature else {}
+    for i, instance_count in allocation.items():
+      campaign = self.campaigns[i]
+      # Squeezed out by the budget: keep running at the current size rather than lose the run.
+      if instance_count == 0: continue
+      if self._worth_restarting(campaign, instance_count):
+        self._stop(campaign)
+        self._start(campaign, instance_count)
+    return {i: c.instance_count for i, c in enumerate(self.campaigns)}
+
+  def run(self, interval: float = 60.0) -> None:
+    """Start pending campaigns and rebalance every `interval` seconds until every campaign has plateaued."""
+    self.start()
+    while any(not c.finished for c in self.campaigns):
+      time.sleep(interval)
+      self.step()
@@ -0,0 +1,95 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+_WHITESPACE = ' \t\r\n'
+_NUMBER_END = _WHITESPACE + ',]}'
+_decoder = json.JSONDecoder()
+
+class _Buffer:
+  """Text buffer over an iterable of UTF-8 byte chunks."""
+
+  def __init__(self, chunks: Iterable[bytes]):
+    self._chunks = iter(chunks)
+    self._utf8 = codecs.getincrementaldecoder('utf-8')()
+    self.text = ''
+    self.pos = 0
+    self.eof = False
+
+  def fill(self, min_chars: int = 1) -> bool:
+    """Append at least `min_chars` more characters unless the input ends first."""
+    if self.eof: return False
+    parts = [self.text[self.pos:]]
+    added = 0
+    for chunk in self._chunks:
+      text = self._utf8.decode(chunk)
+      parts.append(text)
+      added += len(text)
+      if added >= min_chars: break
+    else:
+      parts.append(self._utf8.decode(b'', final=True))
+      self.eof = True
+    self.text = ''.join(parts)
+    self.pos = 0
+    return added > 0 or not self.eof
+
+  def peek(self) -> Optional[str]:
+    while True:
+      while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE: self.pos += 1
+      if self.pos < len(self.text): return self.text[self.pos]
+      if not self.fill(): return None
+
+  def next_char(self) -> Optional[str]:
+    c = self.peek()
+    if c is not None: self.pos += 1
+    return c
+
+  def expect(self, expected: str) -> None:
+    c = self.next_char()
+    if c != expected: raise ValueError(f"Invalid JSON stream: expected '{expected}', got {c!r}")
+
+  def value(self) -> Any:
+    """Decode one complete JSON value."""
+    while True:
+      if self.peek() is None: raise ValueError("Invalid JSON stream: unexpected end of input")
+      try:
+        obj, end = _decoder.raw_decode(self.text, self.pos)
+        # A number is only complete once a delimiter follows: '2.' or '1e' may continue in the next chunk.
+        is_number = isinstance(obj, (int, float)) and not isinstance(obj, bool)
+        if self.eof or (end < len(self.text) and (not is_number or self.text[end] in _NUMBER_END)):
+          self.pos = end
+          return obj
+      except json.JSONDecodeError:
+        if self.eof: raise
+      # Grow geometrically so a large value is re-parsed O(log n) times, not once per chunk.
+      self.fill(max(len(self.text) - self.pos, 1))
+
+
+def _descend(buf: _Buffer, key: str) -> None:
+  buf.expect('{')
+  if buf.peek() == '}': raise KeyError(key)
+  while True:
+    name = buf.value()
+    buf.expect(':')
+    if name == key: return
+    buf.value()
+    c = buf.next_char()
+    if c == '}': raise KeyError(key)
+    if c != ',': raise ValueError(f"Invalid JSON stream: expected ',' or '}}', got {c!r}")
+
+
+def iter_json_array(chunks: Iterable[bytes], path: Sequence[str] = ()) -> Iterator[Any]:
+  """Yield the elements of a JSON array while the document is still arriving.
+
+  `path` lists the object keys leading from the top-level value to the array.
+  Sibling values that come before it are decoded and discarded.
+  """
+  buf = _Buffer(chunks)
+  for key in path: _descend(buf, key)
+  buf.expect('[')
+  if buf.peek() == ']': return
+  while True:
+    yield buf.value()
+    c = buf.next_char()
+    if c == ']': return
+    if c != ',': raise ValueError(f"Invalid JSON stream: expected ',' or ']', got {c!r}")
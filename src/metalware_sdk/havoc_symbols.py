@@ -0,0 +1,83 @@
+from metalware_sdk.havoc_common_schema import *
+from array import array
+from typing import Optional, Tuple, List, Dict, Iterable, Iterator
+import json
+import zlib
+
+class SymbolTable:
+  """Column-oriented symbol list: address and size arrays plus a name list."""
+  __slots__ = ('addresses', 'sizes', 'names')
+
+  def __init__(self, addresses: Iterable[int] = (), sizes: Iterable[int] = (), names: Iterable[str] = ()) -> None:
+    self.addresses = array('Q', addresses)
+    self.sizes = array('Q', sizes)
+    self.names = list(names)
+    if not len(self.addresses) == len(self.sizes) == len(self.names):
+      raise ValueError("Symbol columns must have the same length")
+
+  @staticmethod
+  def from_symbols(symbols: Iterable[Symbol]) -> 'SymbolTable':
+    table = SymbolTable()
+    for symbol in symbols:
+      table.addresses.append(symbol.address)
+      table.sizes.append(symbol.size)
+      table.names.append(symbol.name)
+    return table
+
+  @staticmethod
+  def from_columnar(obj: Any) -> 'SymbolTable':
+    assert isinstance(obj, dict)
+    return SymbolTable(obj.get("address"), obj.get("size"), obj.get("name"))
+
+  def to_columnar(self) -> dict:
+    return {"address": self.addresses.tolist(), "size": self.sizes.tolist(), "name": self.names}
+
+  def to_symbols(self) -> List[Symbol]:
+    return [Symbol(a, n, s) for a, s, n in zip(self.addresses, self.sizes, self.names)]
+
+  def rows(self) -> Iterator[Tuple[int, str, int]]:
+    return zip(self.addresses, self.names, self.sizes)
+
+  def __len__(self) -> int:
+    return len(self.names)
+
+  def __eq__(self, other: object) -> bool:
+    return isinstance(other, SymbolTable) and sorted(self.rows()) == sorted(other.rows())
+
+  def diff(self, other: 'SymbolTable') -> Tuple['SymbolTable', 'SymbolTable']:
+    """(added, removed) going from `self` to `other`."""
+    old, new = set(self.rows()), set(other.rows())
+    added = [row for row in other.rows() if row not in old]
+    removed = [row for row in self.rows() if row not in new]
+    return SymbolTable._from_rows(added), SymbolTable._from_rows(removed)
+
+  def merged(self, other: 'SymbolTable') -> 'SymbolTable':
+    """Union of both tables; entries of `other` replace same-named entries of `self`."""
+    replaced = set(other.names)
+    rows = [row for row in self.rows() if row[1] not in replaced] + list(other.rows())
+    return SymbolTable._from_rows(rows)
+
+  @staticmethod
+  def _from_rows(rows: List[Tuple[int, str, int]]) -> 'SymbolTable':
+    return SymbolTable((r[0] for r in rows), (r[2] for r in rows), (r[1] for r in rows))
+
+
+def iter_symbols_json(table: SymbolTable, chunk_size: int = 4096) -> Iterator[bytes]:
+  """Serialize `table` as the JSON array of Symbol dicts, `chunk_size` symbols per yielded chunk."""
+  yield b'['
+  rows = []
+  for i, (address, name, size) in enumerate(table.rows()):
+    rows.append(f'{{"address":{address},"name":{json.dumps(name)},"size":{size}}}')
+    if len(rows) == chunk_size:
+      yield ((',' if i >= chunk_size else '') + ','.join(rows)).encode()
+      rows = []
+  if rows: yield ((',' if len(table) > len(rows) else '') + ','.join(rows)).encode()
+  yield b']'
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+  compressor = zlib.compressobj(5, zlib.DEFLATED, 31)
+  for chunk in chunks:
+    out = compressor.compress(chunk)
+    if out: yield out
+  yield compressor.flush()
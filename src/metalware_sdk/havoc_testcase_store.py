@@ -0,0 +1,108 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from typing import Optional, Tuple, List, Dict, Iterable, Iterator
+import sqlite3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS testcase (
+  project TEXT NOT NULL,
+  run_id INTEGER NOT NULL,
+  input_id TEXT NOT NULL,
+  exit_reason TEXT NOT NULL,
+  exit_pc INTEGER NOT NULL,
+  num_blocks INTEGER NOT NULL,
+  timestamp TEXT NOT NULL,
+  PRIMARY KEY (project, run_id, input_id)
+);
+CREATE INDEX IF NOT EXISTS testcase_exit_reason ON testcase (project, exit_reason, run_id);
+CREATE INDEX IF NOT EXISTS testcase_exit_pc ON testcase (project, exit_pc, run_id);
+CREATE INDEX IF NOT EXISTS testcase_num_blocks ON testcase (project, num_blocks);
+CREATE INDEX IF NOT EXISTS testcase_timestamp ON testcase (project, timestamp);
+CREATE TABLE IF NOT EXISTS synced_run (
+  project TEXT NOT NULL,
+  run_id INTEGER NOT NULL,
+  modified_at INTEGER NOT NULL,
+  PRIMARY KEY (project, run_id)
+);
+"""
+
+class TestcaseStore:
+  """Local SQLite index of testcases across projects and runs.
+
+  `sync` pulls testcases from the server; runs whose `modified_at` has not
+  changed since the last sync are skipped. `query` answers filters such as
+  "inputs exiting at PC X in runs 3-9" from indexes instead of scanning every
+  testcase. Pass ":memory:" as the path for a throwaway store.
+  """
+
+  def __init__(self, path: str, client: Optional[HavocClient] = None):
+    self.client = client
+    self.db = sqlite3.connect(path)
+    self.db.executescript(_SCHEMA)
+
+  def close(self) -> None:
+    self.db.close()
+
+  def __enter__(self) -> 'TestcaseStore':
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  def add(self, project_name: str, run_id: int, testcases: Iterable[Testcase]) -> None:
+    rows = ((project_name, run_id, t.input_id, t.exit_reason, t.exit_pc, t.num_blocks, t.timestamp) for t in testcases)
+    with self.db:
+      self.db.executemany("INSERT OR IGNORE INTO testcase VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+  def sync(self, project_name: str, run_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """Fetch testcases of new or modified runs (all runs, or only `run_ids`) and return the run ids synced."""
+    if self.client is None: raise RuntimeError("TestcaseStore has no client to sync from")
+    wanted = set(run_ids) if run_ids is not None else None
+    seen = dict(self.db.execute("SELECT run_id, modified_at FROM synced_run WHERE project = ?", (project_name,)))
+    synced = []
+    for run_id, summary in self.client.get_runs(project_name):
+      if wanted is not None and run_id not in wanted: continue
+      if seen.get(run_id) == summary.modified_at: continue
+      self.add(project_name, run_id, self.client.iter_testcases(project_name, run_id))
+      with self.db:
+        self.db.execute("INSERT OR REPLACE INTO synced_run VALUES (?, ?, ?)", (project_name, run_id, summary.modified_at))
+      synced.append(run_id)
+    return synced
+
+  def _where(self, project_name: str, runs: Optional[Iterable[int]], exit_reason: Optional[str], exit_pc: Optional[int],
+             min_blocks: Optional[int], max_blocks: Optional[int], since: Optional[str], until: Optional[str]) -> Tuple[str, list]:
+    clauses, params = ["project = ?"], [project_name]
+    if isinstance(runs, range) and runs.step == 1:
+      clauses.append("run_id >= ? AND run_id < ?")
+      params += [runs.start, runs.stop]
+    elif runs is not None:
+      runs = list(runs)
+      clauses.append(f"run_id IN ({','.join('?' * len(runs))})")
+      params += runs
+    for clause, value in (("exit_reason = ?", exit_reason), ("exit_pc = ?", exit_pc), ("num_blocks >= ?", min_blocks),
+                          ("num_blocks <= ?", max_blocks), ("timestamp >= ?", since), ("timestamp < ?", until)):
+      if value is not None:
+        clauses.append(clause)
+        params.append(value)
+    return " AND ".join(clauses), params
+
+  def query(self, project_name: str, runs: Optional[Iterable[int]] = None, exit_reason: Optional[str] = None,
+            exit_pc: Optional[int] = None, min_blocks: Optional[int] = None, max_blocks: Optional[int] = None,
+            since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Tuple[int, Testcase]]:
+    """(run_id, testcase) pairs matching every given filter. `runs` may be a range, e.g. range(3, 10)."""
+    where, params = self._where(project_name, runs, exit_reason, exit_pc, min_blocks, max_blocks, since, until)
+    sql = f"SELECT run_id, input_id, exit_reason, exit_pc, num_blocks, timestamp FROM testcase WHERE {where} ORDER BY run_id, timestamp"
+    if limit is not None:
+      sql += " LIMIT ?"
+      params.append(limit)
+    for run_id, *fields in self.db.execute(sql, params):
+      yield run_id, Testcase(*fields)
+
+  def count_by(self, project_name: str, column: str, runs: Optional[Iterable[int]] = None, **filters) -> Dict[Any, int]:
+    """Number of matching testcases per distinct value of `column` (exit_reason, exit_pc, num_blocks or run_id)."""
+    if column not in ("exit_reason", "exit_pc", "num_blocks", "run_id"): raise ValueError(f"Cannot group by {column}")
+    unknown = set(filters) - {"exit_reason", "exit_pc", "min_blocks", "max_blocks", "since", "until"}
+    if unknown: raise ValueError(f"Unknown testcase filters: {sorted(unknown)}")
+    where, params = self._where(project_name, runs, filters.get("exit_reason"), filters.get("exit_pc"), filters.get("min_blocks"),
+                                filters.get("max_blocks"), filters.get("since"), filters.get("until"))
+    return dict(self.db.execute(f"SELECT {column}, COUNT(*) FROM testcase WHERE {where} GROUP BY {column}", params))
@@ -0,0 +1,112 @@
+from metalware_sdk.havoc_common_schema import *
+from metalware_sdk.havoc_client import HavocClient
+from typing import Optional, Tuple, List, Callable
+import queue
+import threading
+
+ACTIVE_STATUSES = (RunStatus.PENDING, RunStatus.RUNNING)
+WATCHED_FIELDS = ('crashes', 'hangs', 'new_blocks')
+_DECODERS = {'crashes': Crash.from_dict, 'hangs': Hang.from_dict, 'new_blocks': Block.from_dict}
+_DONE = object()
+
+class RunWatcher:
+  """Delivers new crashes, hangs and blocks of a run to callbacks as they appear.
+
+  A poller thread fetches the three lists every `interval` seconds and decodes
+  only the entries past the previously seen length; the server appends to
+  them. Events go through a queue of at most `max_pending` entries to a
+  dispatcher thread that runs the callbacks, so a slow callback stalls
+  polling instead of growing memory. Watching ends once the run is no longer
+  active and its final stats are delivered, or on `stop()`. Exceptions raised
+  by callbacks are collected in `errors`. With `replay_existing=False` entries
+  already present when watching starts are skipped.
+  """
+
+  def __init__(self, client: HavocClient, project_name: str, run_id: int,
+               on_crash: Optional[Callable[[Crash], None]] = None,
+               on_hang: Optional[Callable[[Hang], None]] = None,
+               on_new_block: Optional[Callable[[Block], None]] = None,
+               interval: float = 5.0, max_pending: int = 1024, replay_existing: bool = True):
+    self.client = client
+    self.project_name = project_name
+    self.run_id = run_id
+    self.interval = interval
+    self.replay_existing = replay_existing
+    self.errors: List[Exception] = []
+    self._callbacks = {'crashes': on_crash, 'hangs': on_hang, 'new_blocks': on_new_block}
+    self._fields = [name for name in WATCHED_FIELDS if self._callbacks[name] is not None]
+    self._seen = {name: 0 for name in WATCHED_FIELDS}
+    self._events: 'queue.Queue[Tuple[str, Any]]' = queue.Queue(max_pending)
+    self._stopped = threading.Event()
+    self._poller = threading.Thread(target=self._poll_loop, daemon=True)
+    self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+
+  def start(self) -> 'RunWatcher':
+    if not self.replay_existing: self.poll()
+    self._dispatcher.start()
+    self._poller.start()
+    return self
+
+  def stop(self) -> None:
+    self._stopped.set()
+
+  def join(self, timeout: Optional[float] = None) -> None:
+    self._poller.join(timeout)
+    self._dispatcher.join(timeout)
+
+  def __enter__(self) -> 'RunWatcher':
+    return self.start()
+
+  def __exit__(self, *exc) -> None:
+    self.stop()
+    self.join()
+
+  @property
+  def running(self) -> bool:
+    return self._dispatcher.is_alive()
+
+  def poll(self) -> List[Tuple[str, Any]]:
+    """Fetch the stats once and return the (field, item) events not seen before."""
+    if not self._fields: return []
+    raw = self.client.get_run_stats(self.project_name, self.run_id, fields=self._fields).raw
+    events = []
+    for name in self._fields:
+      items = raw.get(name) or []
+      # A shorter list means the run was reset; start over without replaying it.
+      start = self._seen[name] if len(items) >= self._seen[name] else len(items)
+      events += [(name, _DECODERS[name](item)) for item in items[start:]]
+      self._seen[name] = len(items)
+    return events
+
+  def _put(self, event: Any) -> bool:
+    while not self._stopped.is_set():
+      try:
+        self._events.put(event, timeout=0.5)
+        return True
+      except queue.Full:
+        continue
+    return False
+
+  def _poll_loop(self) -> None:
+    try:
+      while not self._stopped.is_set():
+        active = self.client.get_run_status(self.project_name, self.run_id) in ACTIVE_STATUSES
+        for event in self.poll():
+          if not self._put(event): return
+        if not active: return
+        self._stopped.wait(self.interval)
+    except Exception as e:
+      self.errors.append(e)
+    finally:
+      self._events.put(_DONE)
+
+  def _dispatch_loop(self) -> None:
+    while True:
+      event = self._events.get()
+      if event is _DONE: return
+      if self._stopped.is_set(): continue
+      name, item = event
+      try:
+        self._callbacks[name](item)
+      except Exception as e:
+        self.errors.append(e)
@@ -1,18 +1,28 @@
 import json
 from enum import Enum
+from typing import Optional
 
 from metalware_sdk.havoc_client import HavocClient
+from metalware_sdk.havoc_disasm import DisassemblyCache
 
 class WatchType(Enum):
   READ = "read"
   WRITE = "write"
 
 class ReplayDebugger:
-  def __init__(self, client: HavocClient, project_name: str, run_id: int, testcase_id: str):
+  def __init__(self, client: HavocClient, project_name: str, run_id: int, testcase_id: str,
+               disasm_cache: Optional[DisassemblyCache] = None, image_key: Optional[str] = None):
     self._client = client
     self._project_name = project_name
     self._run_id = run_id
     self._testcase_id = testcase_id
+    # Share one cache between sessions; image_key should identify the firmware, e.g. its file hash.
+    self._disasm_cache = disasm_cache
+    self._image_key = image_key or f"{project_name}/{run_id}"
+    # Net steps taken since the last rewind, then since each run() after it. Replay is
+    # deterministic, so this trail is enough to come back to the current point.
+    self._trail: list[int] = [0]
+    self._bookmarks: dict[str, tuple[tuple[int, ...], Optional[tuple]]] = {}
 
     self._client.start_debug_session(self._project_name, self._run_id, self._testcase_id)
 
@@ -22,7 +32,10 @@ class ReplayDebugger:
 
   def run(self) -> str:
     res = self._send_command({"c": "run"})
-    if 'data' in res and 'exit_reason' in res['data']: return res['data']['exit_reason']
+    if 'data' in res and 'exit_reason' in res['data']:
+      # The server does not report how many instructions a run executed.
+      self._trail.append(0)
+      return res['data']['exit_reason']
     else: raise RuntimeError(f"Failed to run: {res}")
 
   def add_breakpoint(self, address: int):
@@ -41,12 +54,16 @@ class ReplayDebugger:
 
   def step(self) -> str:
     res = self._send_command({"c": "step"})
-    if 'data' in res and 'exit_reason' in res['data']: return res['data']['exit_reason']
+    if isinstance(res.get('data'), dict) and 'exit_reason' in res['data']:
+      self._trail[-1] += 1
+      return res['data']['exit_reason']
     else: raise RuntimeError(res['message'])
 
   def step_back(self) -> str:
     res = self._send_command({"c": "step_back"})
-    if 'data' in res and 'exit_reason' in res['data']: return res['data']['exit_reason']
+    if isinstance(res.get('data'), dict) and 'exit_reason' in res['data']:
+      self._trail[-1] = max(self._trail[-1] - 1, 0) if len(self._trail) == 1 else self._trail[-1] - 1
+      return res['data']['exit_reason']
     else: raise RuntimeError(res['message'])
 
   def state(self) -> dict:
@@ -87,7 +104,9 @@ class ReplayDebugger:
 
   def disassemble(self) -> list[str]:
     result = self._send_command({"c": "disassemble"})
-    if 'data' in result and 'disassembly' in result['data']: return result['data']['disassembly']
+    if 'data' in result and 'disassembly' in result['data']:
+      if self._disasm_cache is not None: self._disasm_cache.put(self._image_key, result['data']['disassembly'])
+      return result['data']['disassembly']
     else: raise RuntimeError(result['message'])
 
   def print_asm(self):
@@ -127,10 +146,101 @@ class ReplayDebugger:
 
   def rewind(self) -> None:
     result = self._send_command({"c": "rewind"})
-    if 'success' in result and result['success']: return
+    if 'success' in result and result['success']: self._trail = [0]
     else: raise RuntimeError(result['message'])
 
+  def position(self) -> Optional[int]:
+    """Instructions stepped since the start of the replay, or None after `run` until the next `rewind`."""
+    return self._trail[0] if len(self._trail) == 1 else None
+
+  def _stops(self) -> tuple:
+    return tuple(sorted(self.list_breakpoints())), tuple(sorted((a, t.value) for a, t in self.list_watchpoints()))
+
+  def _move(self, steps: int) -> None:
+    for _ in range(steps): self.step()
+    for _ in range(-steps): self.step_back()
+
+  def bookmark(self, name: str) -> Optional[int]:
+    """Remember the current point under `name` and return its position, if known.
+
+    After `run` the point is remembered as the runs and steps that led to it,
+    together with the breakpoints and watchpoints they ran against.
+    """
+    self._bookmarks[name] = (tuple(self._trail), self._stops() if len(self._trail) > 1 else None)
+    return self.position()
+
+  def bookmarks(self) -> dict[str, Optional[int]]:
+    return {name: trail[0] if len(trail) == 1 else None for name, (trail, _) in self._bookmarks.items()}
+
+  def goto_bookmark(self, name: str) -> None:
+    """Return to a bookmark.
+
+    The debug protocol has no seek command: this costs one round trip per
+    instruction stepped, plus one per `run` replayed when the bookmark was
+    taken after `run`. Such bookmarks can only be reached while the same
+    breakpoints and watchpoints are set; memory and register writes are not
+    replayed.
+    """
+    if name not in self._bookmarks: raise KeyError(f"No bookmark named {name}")
+    trail, stops = self._bookmarks[name]
+    if len(trail) == 1: return self.run_to_instruction_count(trail[0])
+    if stops != self._stops(): raise RuntimeError(f"Breakpoints or watchpoints changed since bookmark {name} was taken")
+    if trail[:-1] == tuple(self._trail[:-1]): return self._move(trail[-1] - self._trail[-1])
+    self.rewind()
+    self._move(trail[0])
+    for steps in trail[1:]:
+      self.run()
+      self._move(steps)
+
+  def run_to_instruction_count(self, count: int) -> None:
+    """Move forwards or backwards to the point where `count` instructions have executed.
+
+    The debug protocol has no seek command, so this rewinds or steps, whichever
+    needs fewer steps; it costs one round trip per instruction stepped.
+    """
+    if count < 0: raise ValueError("Instruction count must be non-negative")
+    current = self.position()
+    if current is None or count < current - count:
+      self.rewind()
+      current = 0
+    self._move(count - current)
+
+  def reverse_continue(self, max_steps: int = 10_000) -> str:
+    """Step back until the pc is on a breakpoint, a write watchpoint's byte changes, or the replay starts.
+
+    The debug protocol has no reverse-continue command, so each instruction
+    costs a `step_back`, a pc read and one memory read per write watchpoint.
+    Read watchpoints cannot be observed from here and are ignored. Once the
+    position is unknown (after `run`), a step back that leaves the pc
+    unchanged is taken as the start of the replay, so a branch to itself also
+    stops the search. Returns the exit reason of the last step, or
+    "start of replay".
+    """
+    breakpoints = set(self.list_breakpoints())
+    watched = [address for address, watch_type in self.list_watchpoints() if watch_type == WatchType.WRITE]
+    values = {address: self.read_memory(address, 1) for address in watched}
+    pc = self.read_register("pc")
+    for _ in range(max_steps):
+      if self.position() == 0: return "start of replay"
+      reason = self.step_back()
+      new_pc = self.read_register("pc")
+      if new_pc == pc and self.position() is None:
+        self._trail[-1] += 1
+        return "start of replay"
+      pc = new_pc
+      if pc in breakpoints: return reason
+      for address in watched:
+        value = self.read_memory(address, 1)
+        if value != values[address]: return reason
+        values[address] = value
+    raise RuntimeError(f"No breakpoint or watchpoint hit within {max_steps} steps back")
+
   def disassemble_range(self, start_addr: int, count: int) -> list[str]:
+    if self._disasm_cache is not None:
+      return self._disasm_cache.disassemble_range(self._image_key, start_addr, count, self._fetch_disassembly_range)
+    return self._fetch_disassembly_range(start_addr, count)
+
+  def _fetch_disassembly_range(self, start_addr: int, count: int) -> list[str]:
     result = self._send_command({"c": "disassemble_range", "start_addr": start_addr, "count": count})
     if 'data' in result and 'disassembly' in result['data']: return result['data']['disassembly']
     else: raise RuntimeError(result['message'])
\ No newline at end of file
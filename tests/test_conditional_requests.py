@@ -0,0 +1,112 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import unittest
+
+from metalware_sdk.havoc_client import HavocClient
+from metalware_sdk.havoc_common_schema import RunStatus, RunStats, LazyRunStats
+
+ETAG = '"v1"'
+LAST_MODIFIED = 'Mon, 19 Oct 2026 12:00:00 GMT'
+SUMMARY = {"created_at": 1, "modified_at": 2, "status": "Running"}
+STATS = {"block_frequency_map": [], "coverage": [[4096, 3]], "crashes": [], "dma_config": {"descriptors": []},
+         "executions": 10, "hangs": [], "new_blocks": [{"address": 4096, "time_to_discover": 5}], "throughput": 100}
+
+class _Handler(BaseHTTPRequestHandler):
+  """Serves a run summary and stats with validators and answers 304 when the client's match."""
+  requests = []
+  validators = {'ETag': ETAG, 'Last-Modified': LAST_MODIFIED}
+
+  def log_message(self, *args) -> None:
+    pass
+
+  def do_GET(self) -> None:
+    _Handler.requests.append(dict(self.headers))
+    if self.headers.get('If-None-Match') == ETAG:
+      self.send_response(304)
+      self.end_headers()
+      return
+    body = json.dumps(STATS if self.path.split('?')[0].endswith('/stats') else SUMMARY).encode()
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    for name, value in _Handler.validators.items(): self.send_header(name, value)
+    self.end_headers()
+    self.wfile.write(body)
+
+
+class ConditionalRequestsTest(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.shutdown()
+    cls.server.server_close()
+
+  def setUp(self):
+    _Handler.requests = []
+    _Handler.validators = {'ETag': ETAG, 'Last-Modified': LAST_MODIFIED}
+
+  def test_not_modified_decodes_previous_body(self):
+    client = HavocClient(self.base_url)
+    first = client.get_run_summary('p', 1)
+    second = client.get_run_summary('p', 1)
+    self.assertEqual(len(_Handler.requests), 2)
+    self.assertEqual(_Handler.requests[1].get('If-None-Match'), ETAG)
+    self.assertEqual(second.to_dict(), first.to_dict())
+    self.assertEqual(second.status, RunStatus.RUNNING)
+    self.assertIsNot(second, first)
+
+  def test_not_modified_mixed_decoders(self):
+    client = HavocClient(self.base_url)
+    lazy = client.get_run_stats('p', 1, lazy=True)
+    eager = client.get_run_stats('p', 1)
+    lazy_again = client.get_run_stats('p', 1, lazy=True)
+    self.assertEqual(_Handler.requests[1].get('If-None-Match'), ETAG)
+    self.assertIsInstance(lazy, LazyRunStats)
+    self.assertIsInstance(eager, RunStats)
+    self.assertIsInstance(lazy_again, LazyRunStats)
+    self.assertEqual(eager.executions, 10)
+
+  def test_not_modified_results_are_independent(self):
+    client = HavocClient(self.base_url)
+    client.get_run_stats('p', 1).new_blocks.append('x')
+    client.get_run_stats('p', 1, lazy=True).raw['new_blocks'].append('x')
+    self.assertEqual(len(client.get_run_stats('p', 1).new_blocks), 1)
+    self.assertEqual(len(client.get_run_stats('p', 1, lazy=True).raw['new_blocks']), 1)
+    self.assertTrue(all(headers.get('If-None-Match') == ETAG for headers in _Handler.requests[1:]))
+
+  def test_sends_validators(self):
+    client = HavocClient(self.base_url)
+    client.get_run_summary('p', 1)
+    client.get_run_summary('p', 1)
+    self.assertNotIn('If-None-Match', _Handler.requests[0])
+    self.assertNotIn('If-Modified-Since', _Handler.requests[0])
+    self.assertEqual(_Handler.requests[1].get('If-None-Match'), ETAG)
+    self.assertEqual(_Handler.requests[1].get('If-Modified-Since'), LAST_MODIFIED)
+
+  def test_no_validators_without_response_headers(self):
+    _Handler.validators = {}
+    client = HavocClient(self.base_url)
+    first = client.get_run_summary('p', 1)
+    second = client.get_run_summary('p', 1)
+    self.assertIsNot(second, first)
+    self.assertNotIn('If-None-Match', _Handler.requests[1])
+
+  def test_disabled(self):
+    client = HavocClient(self.base_url, conditional_requests=False)
+    first = client.get_run_summary('p', 1)
+    second = client.get_run_summary('p', 1)
+    self.assertIsNot(second, first)
+    self.assertEqual(second.status, RunStatus.RUNNING)
+    for headers in _Handler.requests:
+      self.assertNotIn('If-None-Match', headers)
+      self.assertNotIn('If-Modified-Since', headers)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,41 @@
+import json
+import unittest
+
+from metalware_sdk.havoc_stream import iter_json_array
+
+DOCUMENT = {
+  "version": 1,
+  "stats": {"ratio": 2.5, "flag": True, "missing": None},
+  "items": [2.5, 1e3, -17, 0, 3.25e-2, "café ✓", True, False, None, {"a": [1, 2.0]}, [], {}, 12345678901234567890],
+}
+
+class IterJsonArrayTest(unittest.TestCase):
+  def test_split_at_every_offset(self):
+    data = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+    for offset in range(len(data) + 1):
+      with self.subTest(offset=offset):
+        self.assertEqual(list(iter_json_array([data[:offset], data[offset:]], ["items"])), DOCUMENT["items"])
+
+  def test_one_byte_chunks(self):
+    data = json.dumps(DOCUMENT["items"], separators=(',', ':')).encode()
+    self.assertEqual(list(iter_json_array(data[i:i + 1] for i in range(len(data)))), DOCUMENT["items"])
+
+  def test_numbers_split_inside(self):
+    self.assertEqual(list(iter_json_array([b'[2.', b'5]'])), [2.5])
+    self.assertEqual(list(iter_json_array([b'[1e', b'3]'])), [1e3])
+    self.assertEqual(list(iter_json_array([b'[1', b'0 , -', b'4]'])), [10, -4])
+
+  def test_empty_array(self):
+    self.assertEqual(list(iter_json_array([b' [ ', b' ] '])), [])
+
+  def test_missing_key(self):
+    with self.assertRaises(KeyError):
+      list(iter_json_array([b'{"a": [1]}'], ["b"]))
+
+  def test_truncated(self):
+    with self.assertRaises(ValueError):
+      list(iter_json_array([b'[1, 2']))
+
+
+if __name__ == '__main__':
+  unittest.main()